@@ -1,28 +1,40 @@
 
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
+import inspect
 import itertools as it
 import numpy as np
 import operator as op
 
 import time
+import weakref
 
 from PIL import Image
-from scipy.spatial.distance import pdist
 import cairo
 
+from camera.display_list import DisplayList
+from camera.display_list import ImageDisplayItem
+from camera.display_list import PointCloudDisplayItem
+from camera.display_list import SurfaceMeshDisplayItem
+from camera.display_list import VectorizedDisplayItem
 from constants import *
 from mobject.types.image_mobject import AbstractImageMobject
 from mobject.mobject import Mobject
 from mobject.types.point_cloud_mobject import PMobject
 from mobject.types.vectorized_mobject import VMobject
+from mobject.three_dimensions import SurfaceMesh
 from utils.color import color_to_int_rgba
 from utils.color import rgb_to_hex
 from utils.config_ops import digest_config
+from utils.images import alpha_composite_in_place
+from utils.images import get_bilinear_samples
 from utils.images import get_full_raster_image_path
+from utils.images import get_nonzero_alpha_bounding_box
 from utils.iterables import batch_by_property
 from utils.iterables import list_difference_update
 from utils.iterables import remove_list_redundancies
 from utils.simple_functions import fdiv
-from utils.space_ops import angle_of_vector
 from utils.space_ops import get_norm
 from functools import reduce
 
@@ -49,12 +61,43 @@ class Camera(object):
         # round z coordinate to nearest hundredth when comparring
         "z_buff_func": lambda m: np.round(m.get_center()[2], 2),
         "cairo_line_width_multiple": 0.01,
+        # If True, only those tiles of the pixel array which were
+        # covered by mobjects drawn in the last frame, or which will
+        # be covered by those drawn in this frame, are reset and redrawn.
+        # Everything else is kept from the previous frame.
+        "use_dirty_tiles": False,
+        "dirty_tile_size": 32,
+        # Cairo's default, used to bound how far a mitered
+        # corner can poke out from a stroked path
+        "cairo_miter_limit": 10,
+        # Skip drawing any family member whose bounding box,
+        # padded for stroke width, lies entirely outside the frame.
+        # Finding those boxes costs time even when everything is
+        # on screen, so this only pays off for scenes which leave
+        # much of what they draw outside the frame.
+        "cull_offscreen_mobjects": False,
+        # If greater than 1, vectorized mobjects are rasterized into
+        # this many horizontal bands of the pixel array at once, each
+        # with its own cairo context, on a pool of threads.  Cairo
+        # releases the GIL while filling and stroking.
+        "n_rendering_threads": 1,
     }
 
     def __init__(self, background=None, **kwargs):
         digest_config(self, kwargs, locals())
         self.rgb_max_val = np.iinfo(self.pixel_array_dtype).max
         self.pixel_array_to_cairo_context = {}
+        self.pixel_array_to_band_cairo_contexts = {}
+        self.rendering_thread_pool = None
+        self.vmobject_to_cairo_path = weakref.WeakKeyDictionary()
+        self.image_mobject_to_texture = weakref.WeakKeyDictionary()
+        # Only set, by MultiCamera, while a frame is being drawn
+        # by several cameras which can share them.  See
+        # get_vmobject_batch_key and set_cairo_context_batch_path.
+        self.frame_batch_keys = None
+        self.frame_batch_paths = None
+        self.dirty_tile_state = None
+        self.pixel_array_to_dirty_tile_state = {}
         self.init_background()
         self.resize_frame_shape()
         self.reset()
@@ -138,33 +181,65 @@ class Camera(object):
 
     def get_image(self, pixel_array=None):
         if pixel_array is None:
-            pixel_array = self.pixel_array
+            pixel_array = self.get_pixel_array()
         return Image.fromarray(
             pixel_array,
             mode=self.image_mode
         )
 
     def get_pixel_array(self):
+        if self.dirty_tiles_are_pending():
+            self.restore_dirty_tiles()
         return self.pixel_array
 
+    def set_pixel_array_buffer(self, buffer):
+        """
+        From now on, the camera draws into buffer, which should have
+        the pixel array's shape and dtype, leaving the old pixel array
+        as it was.  Each buffer keeps its own dirty tile state, so when
+        cycling through a few, each is reset only where it was drawn
+        over since it was last used.
+        """
+        if buffer is self.pixel_array:
+            return
+        self.pixel_array_to_dirty_tile_state[id(self.pixel_array)] = (
+            weakref.ref(self.pixel_array), self.dirty_tile_state
+        )
+        ref, state = self.pixel_array_to_dirty_tile_state.pop(
+            id(buffer), (None, None)
+        )
+        if ref is None or ref() is not buffer:
+            # Either new, or another array which happens to share its id
+            state = None
+        self.pixel_array = buffer
+        self.dirty_tile_state = state
+
     def convert_pixel_array(self, pixel_array, convert_from_floats=False):
         retval = np.array(pixel_array)
         if convert_from_floats:
-            retval = np.apply_along_axis(
-                lambda f: (f * self.rgb_max_val).astype(self.pixel_array_dtype),
-                2,
-                retval
-            )
+            retval = (retval * self.rgb_max_val).astype(self.pixel_array_dtype)
         return retval
 
     def set_pixel_array(self, pixel_array, convert_from_floats=False):
+        if self.can_defer_to_dirty_tiles(pixel_array, convert_from_floats):
+            # Only the tiles drawn over since the last reset differ
+            # from pixel_array, and those get restored once it's known
+            # what will be drawn next
+            self.dirty_tile_state["pending"] = True
+            return
         converted_array = self.convert_pixel_array(
             pixel_array, convert_from_floats)
-        if not (hasattr(self, "pixel_array") and self.pixel_array.shape == converted_array.shape):
+        if not hasattr(self, "pixel_array"):
+            self.pixel_array = converted_array
+        elif self.pixel_array.shape != converted_array.shape:
+            # Nothing draws into the old array again, and its cached
+            # contexts would otherwise keep it alive
+            self.forget_cairo_contexts(self.pixel_array)
             self.pixel_array = converted_array
         else:
             # Set in place
             self.pixel_array[:, :, :] = converted_array[:, :, :]
+        self.reset_dirty_tile_state(pixel_array)
 
     def set_background(self, pixel_array, convert_from_floats=False):
         self.background = self.convert_pixel_array(
@@ -193,6 +268,124 @@ class Camera(object):
         self.set_background(
             self.make_background_from_func(coords_to_colors_func))
 
+    def make_background_from_array_func(self, coords_to_colors_array_func,
+                                        use_cache=True, cache_key=None):
+        """
+        Vectorized alternative to make_background_from_func.
+        coords_to_colors_array_func is called once, with the (height, width, 2)
+        array of (x, y) space coordinates of all pixels, and is expected to
+        return a (height, width, 4) array of RGBA floats.
+
+        Results are cached in BACKGROUND_DIR, keyed by cache_key, if given,
+        or else by the function's source, the values it closes over and its
+        default arguments, along with the shape and position of the frame.
+        Without a cache_key, nothing is cached if one of those values can
+        only be told apart by its memory address, like most functions
+        and objects.
+        """
+        if use_cache:
+            key = self.get_background_cache_key(
+                coords_to_colors_array_func, cache_key
+            )
+            use_cache = key is not None
+        if use_cache:
+            cache_file = os.path.join(BACKGROUND_DIR, key + ".npy")
+            if os.path.exists(cache_file):
+                return np.load(cache_file)
+        coords = self.get_coords_of_all_pixels()
+        colors = np.asarray(coords_to_colors_array_func(coords))
+        expected_shape = (self.get_pixel_height(), self.get_pixel_width(), 4)
+        if colors.shape != expected_shape:
+            raise Exception(
+                "Background function returned array of shape %s, expected %s" % (
+                    str(colors.shape), str(expected_shape)
+                )
+            )
+        new_background = self.convert_pixel_array(
+            np.clip(colors, 0, 1), convert_from_floats=True
+        )
+        if use_cache:
+            # Write then rename, so a partial file is never picked up
+            temp_file = cache_file + ".%d.tmp" % os.getpid()
+            with open(temp_file, "wb") as outfile:
+                np.save(outfile, new_background)
+            os.replace(temp_file, cache_file)
+        return new_background
+
+    def set_background_from_array_func(self, coords_to_colors_array_func,
+                                       use_cache=True, cache_key=None):
+        self.set_background(self.make_background_from_array_func(
+            coords_to_colors_array_func, use_cache, cache_key
+        ))
+
+    def get_background_cache_key(self, func, cache_key=None):
+        """
+        Returns None if func can't be reliably identified
+        """
+        if cache_key is not None:
+            func_id = str(cache_key)
+        else:
+            func_id = self.get_background_func_id(func)
+            if func_id is None:
+                return None
+        id_str = "".join(map(str, [
+            func_id,
+            self.pixel_array_dtype,
+            self.get_pixel_height(),
+            self.get_pixel_width(),
+            self.get_frame_height(),
+            self.get_frame_width(),
+            list(self.get_frame_center()),
+        ]))
+        hasher = hashlib.sha256()
+        hasher.update(id_str.encode())
+        return hasher.hexdigest()[:16]
+
+    def get_background_func_id(self, func):
+        try:
+            func_id = inspect.getsource(func)
+        except (OSError, TypeError):
+            func_id = repr(func.__code__.co_code) + repr(func.__code__.co_consts)
+        # Values captured from the enclosing scope, and default arguments,
+        # change the output without changing the source
+        closure = getattr(func, "__closure__", None) or []
+        values = [cell.cell_contents for cell in closure]
+        values.append(getattr(func, "__defaults__", None))
+        values_id = self.get_background_func_value_id(values)
+        if values_id is None:
+            return None
+        return func_id + values_id
+
+    def get_background_func_value_id(self, value):
+        """
+        Returns a string which differs for any two values that differ,
+        or None if there's no such string to be had
+        """
+        if isinstance(value, np.ndarray):
+            # The repr of a large array leaves out its middle
+            hasher = hashlib.sha256()
+            hasher.update(np.ascontiguousarray(value).tobytes())
+            return "array(%s, %s, %s)" % (
+                value.dtype, value.shape, hasher.hexdigest()
+            )
+        if isinstance(value, (list, tuple)):
+            parts = [self.get_background_func_value_id(v) for v in value]
+        elif isinstance(value, dict):
+            parts = [
+                self.get_background_func_value_id(pair)
+                for pair in sorted(value.items(), key=lambda p: repr(p[0]))
+            ]
+        else:
+            value_repr = repr(value)
+            # Such reprs, like those of functions and most other
+            # objects, change from run to run
+            if " at 0x" in value_repr:
+                return None
+            return value_repr
+        if None in parts:
+            return None
+        return "%s(%s)" % (type(value).__name__, ", ".join(parts))
+
     def reset(self):
         self.set_pixel_array(self.background)
         return self
@@ -234,10 +427,10 @@ class Camera(object):
         fh = self.get_frame_height()
         fw = self.get_frame_width()
         return not reduce(op.or_, [
-            mobject.get_right()[0] < fc[0] - fw,
-            mobject.get_bottom()[1] > fc[1] + fh,
-            mobject.get_left()[0] > fc[0] + fw,
-            mobject.get_top()[1] < fc[1] - fh,
+            mobject.get_right()[0] < fc[0] - fw / 2,
+            mobject.get_bottom()[1] > fc[1] + fh / 2,
+            mobject.get_left()[0] > fc[0] + fw / 2,
+            mobject.get_top()[1] < fc[1] - fh / 2,
         ])
 
     def capture_mobject(self, mobject, **kwargs):
@@ -245,12 +438,16 @@ class Camera(object):
 
     def capture_mobjects(self, mobjects, **kwargs):
         mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        mobjects = self.prepare_to_draw(
+            mobjects, self.get_mobject_pixel_bounding_boxes
+        )
 
         # Organize this list into batches of the same type, and
         # apply corresponding function to those batches
         type_func_pairs = [
             (VMobject, self.display_multiple_vectorized_mobjects),
             (PMobject, self.display_multiple_point_cloud_mobjects),
+            (SurfaceMesh, self.display_multiple_surface_meshes),
             (AbstractImageMobject, self.display_multiple_image_mobjects),
             (Mobject, lambda batch, pa: batch),  # Do nothing
         ]
@@ -271,25 +468,515 @@ class Camera(object):
                 if batch_type == mobject_type:
                     func(batch, self.pixel_array)
 
+    def prepare_to_draw(self, to_draw, get_pixel_bounding_boxes):
+        """
+        Updates dirty tiles for, and culls those off screen from,
+        to_draw, a list of mobjects or display list items, whose
+        boxes are found by get_pixel_bounding_boxes.
+        """
+        if not (self.cull_offscreen_mobjects or self.use_dirty_tiles):
+            return to_draw
+        # Computed once, and shared by culling and dirty tiles
+        bounding_boxes = get_pixel_bounding_boxes(to_draw)
+        if self.use_dirty_tiles:
+            self.update_dirty_tiles(bounding_boxes)
+        if self.cull_offscreen_mobjects:
+            to_draw = [
+                obj
+                for obj, bounding_box in zip(to_draw, bounding_boxes)
+                if bounding_box is not None
+            ]
+        return to_draw
+
+    # Methods associated with display lists
+
+    def get_display_list(self, mobjects, **kwargs):
+        """
+        Records what capture_mobjects would draw for mobjects,
+        without drawing anything.
+        """
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        if self.cull_offscreen_mobjects:
+            mobjects = [
+                mobject
+                for mobject, bounding_box in zip(
+                    mobjects, self.get_mobject_pixel_bounding_boxes(mobjects)
+                )
+                if bounding_box is not None
+            ]
+        display_list = DisplayList(
+            self.pixel_array.shape[:2],
+            self.get_frame_center(),
+            self.get_frame_width(),
+            self.get_frame_height(),
+        )
+        for mobject in mobjects:
+            item = self.get_display_item(mobject)
+            if item is not None:
+                display_list.add_item(item)
+        return display_list
+
+    def get_display_item(self, mobject):
+        # Everything is copied, since the mobjects will likely have
+        # changed by the time it's drawn, except for the mipmap levels
+        # of images with a mipmap key, which never change in place
+        if isinstance(mobject, VMobject):
+            if mobject.is_subpath:
+                return None
+            return self.get_vectorized_display_item(mobject)
+        elif isinstance(mobject, PMobject):
+            if mobject.get_num_points() == 0:
+                return None
+            return PointCloudDisplayItem(
+                np.array(self.transform_points_pre_display(
+                    mobject, mobject.points
+                )),
+                np.array(mobject.rgbas),
+                mobject.stroke_width,
+            )
+        elif isinstance(mobject, AbstractImageMobject):
+            mipmap_levels = mobject.get_mipmap_levels()
+            mipmap_key = mobject.get_mipmap_key()
+            if mipmap_key is None:
+                mipmap_levels = [np.array(level) for level in mipmap_levels]
+            return ImageDisplayItem(
+                np.array(self.transform_points_pre_display(
+                    mobject, mobject.points[:3]
+                )),
+                mipmap_levels,
+                mipmap_key,
+            )
+        elif isinstance(mobject, SurfaceMesh):
+            return self.get_surface_mesh_display_item(mobject)
+        return None
+
+    def get_vectorized_display_item(self, vmobject):
+        vmobjects = [vmobject] + vmobject.get_subpath_mobjects()
+        fill_rgbas = np.array(self.get_fill_rgbas(vmobject))
+        stroke_rgbas = np.array(self.get_stroke_rgbas(vmobject))
+        background_stroke_rgbas = np.array(
+            self.get_stroke_rgbas(vmobject, background=True)
+        )
+        all_rgbas = [fill_rgbas, stroke_rgbas, background_stroke_rgbas]
+        if any([len(rgbas) > 1 for rgbas in all_rgbas]):
+            gradient_points = np.array(self.transform_points_pre_display(
+                vmobject, vmobject.get_gradient_start_and_end_points()
+            ))
+        else:
+            # Only used for gradients, and slow to find
+            gradient_points = np.zeros((2, 3))
+        return VectorizedDisplayItem(
+            subpaths=[
+                np.array(self.transform_points_pre_display(vm, vm.points))
+                for vm in vmobjects
+            ],
+            closed=[vm.is_closed() for vm in vmobjects],
+            fill_rgbas=fill_rgbas,
+            stroke_rgbas=stroke_rgbas,
+            stroke_width=vmobject.get_stroke_width(),
+            background_stroke_rgbas=background_stroke_rgbas,
+            background_stroke_width=vmobject.get_stroke_width(background=True),
+            gradient_points=gradient_points,
+            background_image_file=vmobject.get_background_image_file(),
+        )
+
+    def set_frame_from_display_list(self, display_list):
+        """
+        Makes this camera's frame cover the same region of space as
+        the frame display_list was recorded in, so that replaying it
+        with capture_display_list reproduces that frame, at this
+        camera's own resolution.
+        """
+        self.set_frame_center(display_list.frame_center)
+        self.set_frame_width(display_list.frame_width)
+        self.set_frame_height(display_list.frame_height)
+        return self
+
+    def capture_display_list(self, display_list):
+        """
+        Draws what was recorded in display_list by get_display_list,
+        possibly by another camera, within this camera's own frame.
+        """
+        items = self.prepare_to_draw(
+            display_list.get_items(),
+            self.get_display_item_pixel_bounding_boxes,
+        )
+        type_func_pairs = [
+            (VectorizedDisplayItem, self.display_multiple_vectorized_items),
+            (PointCloudDisplayItem, self.display_multiple_point_cloud_items),
+            (ImageDisplayItem, self.display_multiple_image_items),
+            (SurfaceMeshDisplayItem, self.display_multiple_surface_mesh_items),
+        ]
+        batch_type_pairs = batch_by_property(items, type)
+        for batch, batch_type in batch_type_pairs:
+            for item_type, func in type_func_pairs:
+                if batch_type is item_type:
+                    func(batch, self.pixel_array)
+
+    def display_multiple_vectorized_items(self, items, pixel_array):
+        batch_file_pairs = batch_by_property(
+            items, lambda item: item.background_image_file
+        )
+        for batch, file_name in batch_file_pairs:
+            if file_name:
+                displayer = self.get_background_colored_vmobject_displayer()
+                bounding_box = displayer.get_bounding_box(
+                    batch, self.get_display_item_pixel_bounding_boxes
+                )
+                if bounding_box is None:
+                    continue
+                cvmobject_pixel_array = displayer.display_batches(
+                    [(batch, file_name)], bounding_box,
+                    self.display_multiple_non_background_colored_items,
+                )
+                self.overlay_rgba_array(
+                    pixel_array, cvmobject_pixel_array, bounding_box
+                )
+            else:
+                self.display_multiple_non_background_colored_items(
+                    batch, pixel_array
+                )
+
+    def display_multiple_non_background_colored_items(self, items, pixel_array):
+        ctx = self.get_cairo_context(pixel_array)
+        batch_key_pairs = batch_by_property(
+            items, self.get_vectorized_item_batch_key
+        )
+        for batch, batch_key in batch_key_pairs:
+            if batch_key is None or len(batch) == 1:
+                for item in batch:
+                    self.display_vectorized_item(item, ctx)
+            elif batch_key[0] != "invisible":
+                ctx.new_path()
+                self.add_cairo_subpaths_from_points_list(
+                    ctx,
+                    [item.subpaths[0] for item in batch],
+                    [item.closed[0] for item in batch],
+                )
+                self.apply_batch_style(ctx, batch_key)
+
+    def get_vectorized_item_batch_key(self, item):
+        if len(item.subpaths) > 1:
+            return None
+        return self.get_style_batch_key(
+            item.fill_rgbas,
+            item.stroke_rgbas,
+            item.stroke_width,
+            item.background_stroke_width,
+            item.subpaths[0],
+        )
+
+    def display_vectorized_item(self, item, ctx):
+        ctx.new_path()
+        self.add_cairo_subpaths_from_points_list(
+            ctx, item.subpaths, item.closed
+        )
+        for rgbas, width in [
+            (item.background_stroke_rgbas, item.background_stroke_width),
+            (item.fill_rgbas, None),
+            (item.stroke_rgbas, item.stroke_width),
+        ]:
+            if width == 0:
+                continue
+            if len(rgbas) == 1:
+                self.set_cairo_context_rgba(ctx, rgbas[0])
+            else:
+                self.set_cairo_context_gradient(
+                    ctx, rgbas, item.gradient_points
+                )
+            if width is None:
+                ctx.fill_preserve()
+            else:
+                ctx.set_line_width(width * self.cairo_line_width_multiple)
+                ctx.stroke_preserve()
+
+    def display_multiple_point_cloud_items(self, items, pixel_array):
+        for item in items:
+            self.splat_pixel_coords(
+                self.space_points_to_pixel_float_coords(
+                    item.points
+                ).astype('int'),
+                item.rgbas,
+                self.adjusted_thickness(item.stroke_width),
+                pixel_array,
+            )
+
+    def display_multiple_image_items(self, items, pixel_array):
+        for item in items:
+            corner_coords = self.space_points_to_pixel_float_coords(
+                item.corner_points
+            )
+            pixel_width, pixel_height = self.get_texture_size(corner_coords)
+            texture = self.make_texture(
+                item.mipmap_levels, pixel_width, pixel_height
+            )
+            self.display_texture(texture, corner_coords, pixel_array)
+
+    def get_display_item_pixel_bounding_box(self, item):
+        return self.get_display_item_pixel_bounding_boxes([item])[0]
+
+    def get_display_item_pixel_bounding_boxes(self, items):
+        return self.get_pixel_bounding_boxes(
+            [item.get_all_points() for item in items],
+            list(map(self.get_display_item_pixel_padding, items)),
+        )
+
+    def get_display_item_pixel_padding(self, item):
+        if isinstance(item, VectorizedDisplayItem):
+            return self.get_stroke_pixel_padding(max(
+                item.stroke_width, item.background_stroke_width
+            ))
+        elif isinstance(item, PointCloudDisplayItem):
+            return 2 + self.adjusted_thickness(item.stroke_width)
+        elif isinstance(item, SurfaceMeshDisplayItem):
+            return self.get_stroke_pixel_padding(item.stroke_width)
+        return 2
+
+    # Methods associated with dirty tiles
+
+    def reset_dirty_tile_state(self, source_array):
+        tile_size = self.dirty_tile_size
+        ph, pw = self.pixel_array.shape[:2]
+        self.dirty_tile_state = {
+            "source": source_array,
+            "drawn_tiles": np.zeros(
+                (-(-ph // tile_size), -(-pw // tile_size)),
+                dtype=bool
+            ),
+            "pending": False,
+        }
+
+    def can_defer_to_dirty_tiles(self, pixel_array, convert_from_floats):
+        state = self.dirty_tile_state
+        if not self.use_dirty_tiles or convert_from_floats:
+            return False
+        if state is None or state["source"] is not pixel_array:
+            return False
+        return self.pixel_array.shape == pixel_array.shape
+
+    def dirty_tiles_are_pending(self):
+        state = self.dirty_tile_state
+        return state is not None and state["pending"]
+
+    def update_dirty_tiles(self, bounding_boxes):
+        state = self.dirty_tile_state
+        if state is None:
+            return
+        new_tiles = self.get_tiles_covering_bounding_boxes(bounding_boxes)
+        if state["pending"]:
+            self.restore_dirty_tiles(new_tiles)
+        else:
+            state["drawn_tiles"] |= new_tiles
+
+    def restore_dirty_tiles(self, new_tiles=None):
+        """
+        Resets all tiles drawn over since the pixel array was last
+        set from the state's source array, together with new_tiles,
+        and marks new_tiles as the only ones drawn over
+        """
+        state = self.dirty_tile_state
+        if new_tiles is None:
+            new_tiles = np.zeros_like(state["drawn_tiles"])
+        to_restore = state["drawn_tiles"] | new_tiles
+        source = state["source"]
+        tile_size = self.dirty_tile_size
+        for row_index, row in enumerate(to_restore):
+            # Copy each horizontal run of dirty tiles in one slice
+            edges = np.diff(np.hstack([[0], row.astype(int), [0]]))
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+            y_slice = slice(
+                row_index * tile_size, (row_index + 1) * tile_size
+            )
+            for start, end in zip(starts, ends):
+                x_slice = slice(start * tile_size, end * tile_size)
+                self.pixel_array[y_slice, x_slice] = source[y_slice, x_slice]
+        state["drawn_tiles"] = new_tiles
+        state["pending"] = False
+
+    def get_tiles_covering_bounding_boxes(self, bounding_boxes):
+        tiles = np.zeros_like(self.dirty_tile_state["drawn_tiles"])
+        tile_size = self.dirty_tile_size
+        for bounding_box in bounding_boxes:
+            if bounding_box is None:
+                continue
+            x0, y0, x1, y1 = bounding_box
+            tiles[
+                y0 // tile_size:y1 // tile_size + 1,
+                x0 // tile_size:x1 // tile_size + 1,
+            ] = True
+        return tiles
+
+    def get_mobject_pixel_bounding_box(self, mobject):
+        """
+        Returns (x_min, y_min, x_max, y_max), in pixel coordinates and
+        clipped to the pixel array, of a region containing everything
+        drawn for mobject, or None if that region is off screen.
+        """
+        return self.get_mobject_pixel_bounding_boxes([mobject])[0]
+
+    def get_mobject_pixel_bounding_boxes(self, mobjects):
+        """
+        get_mobject_pixel_bounding_box for each of mobjects, all
+        found at once
+        """
+        return self.get_pixel_bounding_boxes(
+            list(map(self.get_mobject_bounding_points, mobjects)),
+            list(map(self.get_mobject_pixel_padding, mobjects)),
+        )
+
+    def get_mobject_bounding_points(self, mobject):
+        """
+        Points, through transform_points_pre_display, whose
+        bounding box contains mobject as drawn
+        """
+        points = mobject.points
+        if len(points) == 0:
+            return points
+        if isinstance(mobject, VMobject) and not mobject.is_subpath:
+            # Subpaths are drawn as part of their parent's path
+            subpath_points = [
+                sm.points for sm in mobject.get_subpath_mobjects()
+            ]
+            if subpath_points:
+                points = np.vstack([points] + subpath_points)
+        if isinstance(mobject, AbstractImageMobject):
+            # Include the fourth corner
+            ul, ur, dl = points[:3]
+            points = np.vstack([points, [ur + dl - ul]])
+        return self.transform_points_pre_display(mobject, points)
+
+    def get_pixel_bounding_box(self, points, padding):
+        """
+        Bounding box, as returned by get_mobject_pixel_bounding_box,
+        of points which have already been through
+        transform_points_pre_display, padded by padding pixels
+        """
+        return self.get_pixel_bounding_boxes([points], [padding])[0]
+
+    def get_pixel_bounding_boxes(self, points_list, paddings):
+        """
+        get_pixel_bounding_box for each of points_list, padded by the
+        corresponding entry of paddings.  The points are all stacked
+        together and mapped to pixels at once, with the extremes of
+        each found by reduceat, as in ThreeDCamera.get_z_keys.
+        """
+        bounding_boxes = [None] * len(points_list)
+        lengths = np.array([len(points) for points in points_list], dtype=int)
+        has_points = lengths > 0
+        if not np.any(has_points):
+            return bounding_boxes
+        coords = self.space_points_to_pixel_float_coords(np.vstack([
+            points for points in points_list if len(points) > 0
+        ]))
+        starts = (np.cumsum(lengths) - lengths)[has_points]
+        paddings = np.array(paddings, dtype=float)[has_points, np.newaxis]
+        is_finite = np.logical_and.reduceat(
+            np.all(np.isfinite(coords), 1), starts
+        )
+        with np.errstate(invalid="ignore"):
+            mins = np.floor(np.minimum.reduceat(coords, starts) - paddings)
+            maxs = np.ceil(np.maximum.reduceat(coords, starts) + paddings)
+        ph, pw = self.pixel_array.shape[:2]
+        # Those with points that aren't finite could be anywhere
+        mins[~is_finite] = 0
+        maxs[~is_finite] = (pw - 1, ph - 1)
+        on_screen = reduce(op.and_, [
+            maxs[:, 0] >= 0, maxs[:, 1] >= 0,
+            mins[:, 0] < pw, mins[:, 1] < ph,
+        ])
+        clipped = np.hstack([
+            np.maximum(mins, 0),
+            np.minimum(maxs, (pw - 1, ph - 1)),
+        ]).astype(int)
+        found_boxes = [
+            tuple(box) if is_on_screen else None
+            for box, is_on_screen in zip(clipped.tolist(), on_screen.tolist())
+        ]
+        if np.all(has_points):
+            return found_boxes
+        for index, box in zip(np.where(has_points)[0], found_boxes):
+            bounding_boxes[index] = box
+        return bounding_boxes
+
+    def get_mobject_pixel_padding(self, mobject):
+        if isinstance(mobject, VMobject):
+            return self.get_stroke_pixel_padding(max(
+                mobject.get_stroke_width(),
+                mobject.get_stroke_width(background=True),
+            ))
+        if isinstance(mobject, SurfaceMesh):
+            return self.get_stroke_pixel_padding(mobject.get_stroke_width())
+        # Leave room for antialiasing
+        padding = 2
+        if isinstance(mobject, PMobject):
+            padding += self.adjusted_thickness(mobject.stroke_width)
+        return padding
+
+    def get_stroke_pixel_padding(self, stroke_width):
+        space_width = stroke_width * self.cairo_line_width_multiple
+        pixels_per_unit = fdiv(
+            self.get_pixel_width(), self.get_frame_width()
+        )
+        # 2 leaves room for antialiasing
+        return 2 + self.cairo_miter_limit * space_width * pixels_per_unit / 2
+
     # Methods associated with svg rendering
 
     def get_cached_cairo_context(self, pixel_array):
-        return self.pixel_array_to_cairo_context.get(
+        cached = self.pixel_array_to_cairo_context.get(
             id(pixel_array), None
         )
+        if cached is None:
+            return None
+        ctx, frame_key = cached
+        current_frame_key = self.get_cairo_frame_key()
+        if frame_key != current_frame_key:
+            # A moved frame only changes how space
+            # coordinates map to pixels
+            ctx.set_matrix(self.get_cairo_matrix())
+            self.cache_cairo_context(pixel_array, ctx)
+        return ctx
 
     def cache_cairo_context(self, pixel_array, ctx):
-        self.pixel_array_to_cairo_context[id(pixel_array)] = ctx
+        self.pixel_array_to_cairo_context[id(pixel_array)] = (
+            ctx, self.get_cairo_frame_key()
+        )
+
+    def forget_cairo_contexts(self, pixel_array):
+        """
+        Drops the contexts, including those for bands, cached for
+        pixel_array, which should be called once nothing will draw
+        into it again
+        """
+        self.pixel_array_to_cairo_context.pop(id(pixel_array), None)
+        for key in list(self.pixel_array_to_band_cairo_contexts.keys()):
+            if key[0] == id(pixel_array):
+                self.pixel_array_to_band_cairo_contexts.pop(key)
+
+    def get_cairo_frame_key(self):
+        fc = self.get_frame_center()
+        return (
+            self.get_pixel_width(), self.get_pixel_height(),
+            self.get_frame_width(), self.get_frame_height(),
+            fc[0], fc[1],
+        )
 
     def get_cairo_context(self, pixel_array):
         cached_ctx = self.get_cached_cairo_context(pixel_array)
         if cached_ctx:
             return cached_ctx
-        pw = self.get_pixel_width()
-        ph = self.get_pixel_height()
-        fw = self.get_frame_width()
-        fh = self.get_frame_height()
-        fc = self.get_frame_center()
+        ctx = self.make_cairo_context(pixel_array)
+        self.cache_cairo_context(pixel_array, ctx)
+        return ctx
+
+    def make_cairo_context(self, pixel_array, row_offset=0):
+        """
+        pixel_array can be a band of rows of the full pixel array,
+        starting at row_offset, in which case the context draws
+        just the part of the frame covered by that band.
+        """
+        ph, pw = pixel_array.shape[:2]
         surface = cairo.ImageSurface.create_for_data(
             pixel_array,
             cairo.FORMAT_ARGB32,
@@ -297,14 +984,45 @@ class Camera(object):
         )
         ctx = cairo.Context(surface)
         ctx.scale(pw, ph)
-        ctx.set_matrix(cairo.Matrix(
+        ctx.set_matrix(self.get_cairo_matrix(row_offset))
+        return ctx
+
+    def get_cairo_matrix(self, row_offset=0):
+        pw = self.get_pixel_width()
+        ph = self.get_pixel_height()
+        fw = self.get_frame_width()
+        fh = self.get_frame_height()
+        fc = self.get_frame_center()
+        return cairo.Matrix(
             fdiv(pw, fw), 0,
             0, -fdiv(ph, fh),
             (pw / 2) - fc[0] * fdiv(pw, fw),
-            (ph / 2) + fc[1] * fdiv(ph, fh),
-        ))
-        self.cache_cairo_context(pixel_array, ctx)
-        return ctx
+            (ph / 2) + fc[1] * fdiv(ph, fh) - row_offset,
+        )
+
+    def get_band_cairo_contexts(self, pixel_array):
+        key = (id(pixel_array), self.n_rendering_threads)
+        if key not in self.pixel_array_to_band_cairo_contexts:
+            ph = pixel_array.shape[0]
+            n_bands = min(self.n_rendering_threads, ph)
+            edges = np.linspace(0, ph, n_bands + 1).astype('int')
+            self.pixel_array_to_band_cairo_contexts[key] = [
+                (self.make_cairo_context(pixel_array[y0:y1], y0), y0)
+                for y0, y1 in zip(edges[:-1], edges[1:])
+            ]
+        band_contexts = self.pixel_array_to_band_cairo_contexts[key]
+        # Cheap enough to do every time, and keeps them right
+        # for cameras whose frame moves
+        for ctx, y0 in band_contexts:
+            ctx.set_matrix(self.get_cairo_matrix(y0))
+        return [ctx for ctx, y0 in band_contexts]
+
+    def get_rendering_thread_pool(self):
+        if self.rendering_thread_pool is None:
+            self.rendering_thread_pool = ThreadPoolExecutor(
+                max_workers=self.n_rendering_threads
+            )
+        return self.rendering_thread_pool
 
     def display_multiple_vectorized_mobjects(self, vmobjects, pixel_array):
         if len(vmobjects) == 0:
@@ -320,9 +1038,189 @@ class Camera(object):
                 self.display_multiple_non_background_colored_vmobjects(batch, pixel_array)
 
     def display_multiple_non_background_colored_vmobjects(self, vmobjects, pixel_array):
+        batch_key_pairs = batch_by_property(
+            vmobjects, self.get_vmobject_batch_key
+        )
+        if self.n_rendering_threads > 1:
+            self.display_vmobject_batches_in_bands(batch_key_pairs, pixel_array)
+            return
         ctx = self.get_cairo_context(pixel_array)
-        for vmobject in vmobjects:
-            self.display_vectorized(vmobject, ctx)
+        for batch, batch_key in batch_key_pairs:
+            if batch_key is None or len(batch) == 1:
+                for vmobject in batch:
+                    self.display_vectorized(vmobject, ctx)
+            else:
+                self.display_vectorized_batch(batch, batch_key, ctx)
+
+    def display_vmobject_batches_in_bands(self, batch_key_pairs, pixel_array):
+        band_contexts = self.get_band_cairo_contexts(pixel_array)
+        # Paths, in user space coordinates, which all bands share,
+        # along with colors and gradients, are worked out once, here.
+        # The band threads then only append paths and fill or stroke
+        # them, which is mostly time spent inside cairo.
+        ctx = band_contexts[0]
+        batch_paths = []
+        for batch, batch_key in batch_key_pairs:
+            if batch_key is None or len(batch) == 1:
+                path_op_pairs = []
+                for vmobject in batch:
+                    if vmobject.is_subpath:
+                        continue
+                    self.set_cairo_context_path(ctx, vmobject)
+                    path_op_pairs.append((
+                        self.vmobject_to_cairo_path[vmobject][1],
+                        self.get_vectorized_draw_ops(vmobject),
+                    ))
+                batch_paths.append(path_op_pairs)
+            elif batch_key[0] == "invisible":
+                batch_paths.append(None)
+            else:
+                self.set_cairo_context_batch_path(ctx, batch)
+                batch_paths.append(ctx.copy_path())
+        ctx.new_path()
+
+        def display_band(band_ctx):
+            for (batch, batch_key), path in zip(batch_key_pairs, batch_paths):
+                if batch_key is None or len(batch) == 1:
+                    for vmobject_path, draw_ops in path:
+                        band_ctx.new_path()
+                        band_ctx.append_path(vmobject_path)
+                        self.apply_draw_ops(band_ctx, draw_ops)
+                else:
+                    self.display_vectorized_batch(
+                        batch, batch_key, band_ctx, path=path
+                    )
+
+        pool = self.get_rendering_thread_pool()
+        futures = [
+            pool.submit(display_band, band_ctx)
+            for band_ctx in band_contexts
+        ]
+        for future in futures:
+            # Raises any exception from the band's thread
+            future.result()
+
+    def get_vmobject_batch_key(self, vmobject):
+        """
+        Consecutive vmobjects sharing the same (non-None) key look
+        exactly the same whether they're drawn one at a time, or as
+        a single path filled or stroked only once.  That's the case
+        for those with only an opaque fill, or only an opaque stroke,
+        in a single color.  Filled ones are only merged with others
+        of the same orientation, so that overlaps never cancel out.
+        """
+        cache = self.frame_batch_keys
+        if cache is None:
+            return self.find_vmobject_batch_key(vmobject)
+        if id(vmobject) not in cache:
+            cache[id(vmobject)] = self.find_vmobject_batch_key(vmobject)
+        return cache[id(vmobject)]
+
+    def find_vmobject_batch_key(self, vmobject):
+        if vmobject.is_subpath or vmobject.get_subpath_mobjects():
+            return None
+        if vmobject.get_stroke_width(background=True) > 0:
+            return None
+        return self.get_style_batch_key(
+            self.get_fill_rgbas(vmobject),
+            self.get_stroke_rgbas(vmobject),
+            vmobject.get_stroke_width(),
+            0,
+            self.transform_points_pre_display(vmobject, vmobject.points),
+        )
+
+    def get_style_batch_key(self, fill_rgbas, stroke_rgbas, stroke_width,
+                            background_stroke_width, points):
+        """
+        See get_vmobject_batch_key.  Points should have already been
+        through transform_points_pre_display.
+        """
+        if background_stroke_width > 0:
+            return None
+        if len(fill_rgbas) > 1 or len(stroke_rgbas) > 1:
+            return None
+        has_fill = fill_rgbas[0][3] > 0
+        has_stroke = stroke_width > 0 and stroke_rgbas[0][3] > 0
+        if has_fill and has_stroke:
+            return None
+        elif has_fill and fill_rgbas[0][3] == 1:
+            anchors = points[::3, :2]
+            signed_area = np.sum(
+                anchors[:-1, 0] * anchors[1:, 1] -
+                anchors[1:, 0] * anchors[:-1, 1]
+            )
+            return ("fill", tuple(fill_rgbas[0]), np.sign(signed_area))
+        elif has_stroke and stroke_rgbas[0][3] == 1:
+            return ("stroke", tuple(stroke_rgbas[0]), stroke_width)
+        elif not (has_fill or has_stroke):
+            # Nothing would be drawn
+            return ("invisible",)
+        return None
+
+    def display_vectorized_batch(self, vmobjects, batch_key, ctx, path=None):
+        style = batch_key[0]
+        if style == "invisible":
+            return self
+        if path is None:
+            self.set_cairo_context_batch_path(ctx, vmobjects)
+        else:
+            ctx.new_path()
+            ctx.append_path(path)
+        self.apply_batch_style(ctx, batch_key)
+        return self
+
+    def apply_batch_style(self, ctx, batch_key):
+        style = batch_key[0]
+        self.set_cairo_context_rgba(ctx, batch_key[1])
+        if style == "fill":
+            ctx.fill_preserve()
+        else:
+            ctx.set_line_width(
+                batch_key[2] * self.cairo_line_width_multiple
+            )
+            ctx.stroke_preserve()
+        return self
+
+    def set_cairo_context_batch_path(self, ctx, vmobjects):
+        ctx.new_path()
+        cache = self.frame_batch_paths
+        key = tuple(map(id, vmobjects))
+        if cache is not None and key in cache:
+            ctx.append_path(cache[key])
+            return self
+        self.add_cairo_subpaths_from_points_list(
+            ctx,
+            [
+                self.transform_points_pre_display(vm, vm.points)
+                for vm in vmobjects
+            ],
+            [vm.is_closed() for vm in vmobjects],
+        )
+        if cache is not None:
+            cache[key] = ctx.copy_path()
+        return self
+
+    def add_cairo_subpaths_from_points_list(self, ctx, points_list, closed_list):
+        points_list = [
+            self.get_cairo_safe_points(points)
+            for points in points_list
+        ]
+        curve_counts = [(len(points) - 1) // 3 for points in points_list]
+        starts = np.array([points[0, :2] for points in points_list])
+        # Each row holds the x, y coordinates of both
+        # handles and the end anchor of a curve
+        all_curve_coords = np.vstack([
+            points[1:3 * n_curves + 1, :2].reshape((n_curves, 6))
+            for points, n_curves in zip(points_list, curve_counts)
+        ]).tolist()
+        curve_coords_iter = iter(all_curve_coords)
+        for start, n_curves, closed in zip(starts.tolist(), curve_counts, closed_list):
+            ctx.new_sub_path()
+            ctx.move_to(*start)
+            for coords in it.islice(curve_coords_iter, n_curves):
+                ctx.curve_to(*coords)
+            if closed:
+                ctx.close_path()
 
     def display_vectorized(self, vmobject, ctx):
         if vmobject.is_subpath:
@@ -330,53 +1228,126 @@ class Camera(object):
             # of by their parent
             return
         self.set_cairo_context_path(ctx, vmobject)
-        self.apply_stroke(ctx, vmobject, background=True)
-        self.apply_fill(ctx, vmobject)
-        self.apply_stroke(ctx, vmobject)
+        self.apply_draw_ops(ctx, self.get_vectorized_draw_ops(vmobject))
+        return self
+
+    def get_vectorized_draw_ops(self, vmobject):
+        """
+        Returns (source, line_width) pairs for the background stroke,
+        fill and stroke of vmobject, in the order they're drawn, where
+        line_width is None for the fill.  Each source is either an rgba
+        tuple, in cairo's order, or a cairo gradient.  Strokes of zero
+        width are left out.
+        """
+        draw_ops = []
+        for kind in ["background_stroke", "fill", "stroke"]:
+            if kind == "fill":
+                rgbas = self.get_fill_rgbas(vmobject)
+                line_width = None
+            else:
+                background = (kind == "background_stroke")
+                width = vmobject.get_stroke_width(background)
+                if width == 0:
+                    continue
+                rgbas = self.get_stroke_rgbas(vmobject, background=background)
+                line_width = width * self.cairo_line_width_multiple
+            if len(rgbas) == 1:
+                source = tuple(rgbas[0][2::-1]) + (rgbas[0][3],)
+            else:
+                source = self.get_cairo_gradient(
+                    rgbas,
+                    self.transform_points_pre_display(
+                        vmobject, vmobject.get_gradient_start_and_end_points()
+                    ),
+                )
+            draw_ops.append((source, line_width))
+        return draw_ops
+
+    def apply_draw_ops(self, ctx, draw_ops):
+        """
+        Fills and strokes the current path, as given
+        by get_vectorized_draw_ops
+        """
+        for source, line_width in draw_ops:
+            if isinstance(source, tuple):
+                ctx.set_source_rgba(*source)
+            else:
+                ctx.set_source(source)
+            if line_width is None:
+                ctx.fill_preserve()
+            else:
+                ctx.set_line_width(line_width)
+                ctx.stroke_preserve()
         return self
 
     def set_cairo_context_path(self, ctx, vmobject):
         ctx.new_path()
-        for vmob in it.chain([vmobject], vmobject.get_subpath_mobjects()):
-            points = self.transform_points_pre_display(
-                vmob, vmob.points
+        subpaths = [
+            (
+                self.transform_points_pre_display(vmob, vmob.points),
+                vmob.is_closed(),
             )
-            if np.any(np.isnan(points)) or np.any(points == np.inf):
-                points = np.zeros((1, 3))
-            ctx.new_sub_path()
-            ctx.move_to(*points[0][:2])
-            for triplet in zip(points[1::3], points[2::3], points[3::3]):
-                ctx.curve_to(*it.chain(*[
-                    point[:2] for point in triplet
-                ]))
-            if vmob.is_closed():
-                ctx.close_path()
+            for vmob in it.chain([vmobject], vmobject.get_subpath_mobjects())
+        ]
+        # Walking the points to rebuild a path is slow, so paths
+        # are cached, keyed on the points they were built from
+        path_key = self.get_cairo_path_key(subpaths)
+        cached = self.vmobject_to_cairo_path.get(vmobject, None)
+        if cached is not None and cached[0] == path_key:
+            ctx.append_path(cached[1])
+            return self
+        for points, closed in subpaths:
+            self.add_cairo_subpath(ctx, points, closed)
+        self.vmobject_to_cairo_path[vmobject] = (path_key, ctx.copy_path())
         return self
 
+    def get_cairo_path_key(self, subpaths):
+        return tuple(
+            (points.shape, points.tobytes(), closed)
+            for points, closed in subpaths
+        )
+
+    def add_cairo_subpath(self, ctx, points, closed):
+        self.add_cairo_subpaths_from_points_list(ctx, [points], [closed])
+
+    def get_cairo_safe_points(self, points):
+        if np.any(np.isnan(points)) or np.any(points == np.inf):
+            return np.zeros((1, 3))
+        return points
+
     def set_cairo_context_color(self, ctx, rgbas, vmobject):
         if len(rgbas) == 1:
-            # Use reversed rgb because cairo surface is
-            # encodes it in reverse order
-            ctx.set_source_rgba(
-                *rgbas[0][2::-1], rgbas[0][3]
-            )
+            self.set_cairo_context_rgba(ctx, rgbas[0])
         else:
             points = vmobject.get_gradient_start_and_end_points()
             points = self.transform_points_pre_display(
                 vmobject, points
             )
-            pat = cairo.LinearGradient(*it.chain(*[
-                point[:2] for point in points
-            ]))
-            step = 1.0 / (len(rgbas) - 1)
-            offsets = np.arange(0, 1 + step, step)
-            for rgba, offset in zip(rgbas, offsets):
-                pat.add_color_stop_rgba(
-                    offset, *rgba[2::-1], rgba[3]
-                )
-            ctx.set_source(pat)
+            self.set_cairo_context_gradient(ctx, rgbas, points)
         return self
 
+    def set_cairo_context_rgba(self, ctx, rgba):
+        # Use reversed rgb because cairo surface is
+        # encodes it in reverse order
+        ctx.set_source_rgba(*rgba[2::-1], rgba[3])
+        return self
+
+    def set_cairo_context_gradient(self, ctx, rgbas, points):
+        ctx.set_source(self.get_cairo_gradient(rgbas, points))
+        return self
+
+    def get_cairo_gradient(self, rgbas, points):
+        pat = cairo.LinearGradient(*it.chain(*[
+            point[:2] for point in points
+        ]))
+        step = 1.0 / (len(rgbas) - 1)
+        offsets = np.arange(0, 1 + step, step)
+        for rgba, offset in zip(rgbas, offsets):
+            pat.add_color_stop_rgba(
+                offset, *rgba[2::-1], rgba[3]
+            )
+        return pat
+
     def apply_fill(self, ctx, vmobject):
         self.set_cairo_context_color(
             ctx, self.get_fill_rgbas(vmobject), vmobject
@@ -414,8 +1385,134 @@ class Camera(object):
 
     def display_multiple_background_colored_vmobject(self, cvmobjects, pixel_array):
         displayer = self.get_background_colored_vmobject_displayer()
-        cvmobject_pixel_array = displayer.display(*cvmobjects)
-        self.overlay_rgba_array(pixel_array, cvmobject_pixel_array)
+        bounding_box = displayer.get_bounding_box(cvmobjects)
+        if bounding_box is None:
+            return self
+        cvmobject_pixel_array = displayer.display(
+            *cvmobjects, bounding_box=bounding_box
+        )
+        self.overlay_rgba_array(
+            pixel_array, cvmobject_pixel_array, bounding_box
+        )
+        return self
+
+    # Methods associated with surface meshes
+
+    def display_multiple_surface_meshes(self, meshes, pixel_array):
+        self.display_multiple_surface_mesh_items(
+            [self.get_surface_mesh_display_item(mesh) for mesh in meshes],
+            pixel_array,
+        )
+
+    def get_surface_mesh_display_item(self, mesh):
+        vertices = self.transform_points_pre_display(mesh, mesh.points)
+        face_order = self.get_surface_mesh_face_order(mesh)
+        fill_rgbas, stroke_rgbas = self.get_surface_mesh_rgbas(mesh)
+        return SurfaceMeshDisplayItem(
+            vertices[mesh.get_face_vertex_indices()[face_order]],
+            fill_rgbas[face_order],
+            stroke_rgbas[face_order],
+            mesh.get_stroke_width(),
+        )
+
+    def get_surface_mesh_face_order(self, mesh):
+        # Subclasses (like ThreeDCamera) may want to
+        # sort faces before they're drawn
+        return np.arange(mesh.get_num_faces())
+
+    def get_surface_mesh_rgbas(self, mesh):
+        """
+        Returns fill and stroke colors for each face of mesh, as
+        (n_faces, 2, 4) arrays, with one color for the first and one
+        for the third corner of each face, between which faces
+        are shaded with a linear gradient.
+        """
+        return tuple([
+            np.repeat(rgbas.reshape((-1, 1, 4)), 2, axis=1)
+            for rgbas in (mesh.get_fill_rgbas(), mesh.get_stroke_rgbas())
+        ])
+
+    def display_multiple_surface_mesh_items(self, items, pixel_array):
+        ctx = self.get_cairo_context(pixel_array)
+        for item in items:
+            self.display_surface_mesh_item(item, ctx)
+
+    def display_surface_mesh_item(self, item, ctx):
+        corner_points = item.corner_points
+        is_finite = np.all(np.isfinite(corner_points), axis=(1, 2))
+        if not np.all(is_finite):
+            corner_points = corner_points[is_finite]
+            fill_rgbas = item.fill_rgbas[is_finite]
+            stroke_rgbas = item.stroke_rgbas[is_finite]
+        else:
+            fill_rgbas = item.fill_rgbas
+            stroke_rgbas = item.stroke_rgbas
+        n_faces = len(corner_points)
+        if n_faces == 0:
+            return
+        has_stroke = item.stroke_width > 0 and \
+            np.any(stroke_rgbas[:, :, 3] > 0)
+        line_width = item.stroke_width * self.cairo_line_width_multiple
+
+        # As with get_style_batch_key, consecutive faces of one opaque
+        # color, without stroke, and wound the same way, are filled as
+        # one path, which looks no different from filling them in turn
+        is_flat = np.all(fill_rgbas[:, 0] == fill_rgbas[:, 1], axis=1)
+        can_batch = is_flat & (fill_rgbas[:, 0, 3] == 1) & (not has_stroke)
+        xs = corner_points[:, :, 0]
+        ys = corner_points[:, :, 1]
+        signed_areas = np.sum(
+            xs * np.roll(ys, -1, axis=1) - np.roll(xs, -1, axis=1) * ys,
+            axis=1,
+        )
+        batches_with_previous = np.logical_and.reduce([
+            can_batch[1:],
+            can_batch[:-1],
+            np.all(fill_rgbas[1:, 0] == fill_rgbas[:-1, 0], axis=1),
+            np.sign(signed_areas[1:]) == np.sign(signed_areas[:-1]),
+        ])
+        batch_starts = np.where(np.append(True, ~batches_with_previous))[0]
+        batch_ends = np.append(batch_starts[1:], n_faces)
+
+        # Walked through as python lists, with the channels of
+        # colors in the order cairo takes them, since this is done
+        # face by face
+        all_coords = corner_points[:, :, :2].tolist()
+        cairo_order = [2, 1, 0, 3]
+        all_fill_rgbas = fill_rgbas[:, :, cairo_order].tolist()
+        all_stroke_rgbas = stroke_rgbas[:, :, cairo_order].tolist()
+        for start, end in zip(batch_starts.tolist(), batch_ends.tolist()):
+            ctx.new_path()
+            for coords in all_coords[start:end]:
+                ctx.move_to(*coords[0])
+                ctx.line_to(*coords[1])
+                ctx.line_to(*coords[2])
+                ctx.line_to(*coords[3])
+                ctx.close_path()
+            coords = all_coords[start]
+            self.set_cairo_context_face_color(
+                ctx, all_fill_rgbas[start], coords[0], coords[2]
+            )
+            ctx.fill_preserve()
+            if has_stroke:
+                self.set_cairo_context_face_color(
+                    ctx, all_stroke_rgbas[start], coords[0], coords[2]
+                )
+                ctx.set_line_width(line_width)
+                ctx.stroke_preserve()
+
+    def set_cairo_context_face_color(self, ctx, cairo_rgbas, start, end):
+        """
+        cairo_rgbas are the colors at start and end, as lists
+        with their rgb already reversed, as cairo expects.
+        """
+        if cairo_rgbas[0] == cairo_rgbas[1]:
+            ctx.set_source_rgba(*cairo_rgbas[0])
+        else:
+            pat = cairo.LinearGradient(*start, *end)
+            pat.add_color_stop_rgba(0, *cairo_rgbas[0])
+            pat.add_color_stop_rgba(1, *cairo_rgbas[1])
+            ctx.set_source(pat)
         return self
 
     # Methods for other rendering
@@ -436,100 +1533,219 @@ class Camera(object):
         pixel_coords = self.points_to_pixel_coords(
             pmobject, points
         )
-        pixel_coords = self.thickened_coordinates(
-            pixel_coords, thickness
-        )
-        rgba_len = pixel_array.shape[2]
-
-        rgbas = (self.rgb_max_val * rgbas).astype(self.pixel_array_dtype)
-        target_len = len(pixel_coords)
-        factor = target_len // len(rgbas)
-        rgbas = np.array([rgbas] * factor).reshape((target_len, rgba_len))
-
-        on_screen_indices = self.on_screen_pixels(pixel_coords)
-        pixel_coords = pixel_coords[on_screen_indices]
-        rgbas = rgbas[on_screen_indices]
-
-        ph = self.get_pixel_height()
-        pw = self.get_pixel_width()
+        self.splat_pixel_coords(pixel_coords, rgbas, thickness, pixel_array)
 
-        flattener = np.array([1, pw], dtype='int')
-        flattener = flattener.reshape((2, 1))
-        indices = np.dot(pixel_coords, flattener)[:, 0]
-        indices = indices.astype('int')
+    def splat_pixel_coords(self, pixel_coords, rgbas, thickness, pixel_array):
+        """
+        Draws a thickness by thickness square around each of the
+        pixel_coords, blending it over what's already there according
+        to its alpha.  Rather than materializing every pixel of every
+        square at once, this makes one pass per offset in the square.
+        """
+        ph, pw = pixel_array.shape[:2]
+        nudges = self.get_thickening_nudges(thickness)
+        # Throw out points too far off screen to touch it
+        margin = np.abs(nudges).max() if len(nudges) > 0 else 0
+        near_screen = reduce(op.and_, [
+            pixel_coords[:, 0] >= -margin,
+            pixel_coords[:, 0] < pw + margin,
+            pixel_coords[:, 1] >= -margin,
+            pixel_coords[:, 1] < ph + margin,
+        ])
+        pixel_coords = pixel_coords[near_screen]
+        rgbas = (self.rgb_max_val * rgbas[near_screen]).astype(
+            self.pixel_array_dtype
+        )
+        all_opaque = np.all(rgbas[:, 3] == self.rgb_max_val)
+        for nudge in nudges:
+            coords = pixel_coords + nudge
+            on_screen = self.on_screen_pixels(coords)
+            xs = coords[on_screen, 0]
+            ys = coords[on_screen, 1]
+            if all_opaque:
+                # Where points coincide, the last one wins, as it
+                # would if they were drawn one at a time
+                pixel_array[ys, xs] = rgbas[on_screen]
+                continue
+            # A fancy indexed assignment keeps only one of several
+            # values for the same pixel, so points which coincide are
+            # blended in separate rounds, each with distinct pixels,
+            # in the order they were given
+            pass_rgbas = rgbas[on_screen]
+            for indices in self.get_distinct_pixel_rounds(xs, ys, pw):
+                round_xs = xs[indices]
+                round_ys = ys[indices]
+                blended = pixel_array[round_ys, round_xs][:, np.newaxis, :]
+                alpha_composite_in_place(
+                    blended, pass_rgbas[indices][:, np.newaxis, :]
+                )
+                pixel_array[round_ys, round_xs] = blended[:, 0, :]
 
-        new_pa = pixel_array.reshape((ph * pw, rgba_len))
-        new_pa[indices] = rgbas
-        pixel_array[:, :] = new_pa.reshape((ph, pw, rgba_len))
+    def get_distinct_pixel_rounds(self, xs, ys, pixel_width):
+        """
+        Splits the indices of the pixels (xs, ys) into rounds, such
+        that no pixel appears twice in a round, and the nth time a
+        pixel appears is in the nth round.  Indices within a round
+        are in increasing order.
+        """
+        n_points = len(xs)
+        if n_points == 0:
+            return []
+        flat_indices = ys * pixel_width + xs
+        order = np.argsort(flat_indices, kind="stable")
+        sorted_indices = flat_indices[order]
+        is_first = np.ones(n_points, dtype=bool)
+        is_first[1:] = sorted_indices[1:] != sorted_indices[:-1]
+        positions = np.arange(n_points)
+        first_positions = np.maximum.accumulate(
+            np.where(is_first, positions, 0)
+        )
+        occurrences = np.empty(n_points, dtype=int)
+        occurrences[order] = positions - first_positions
+        if occurrences.max() == 0:
+            # The usual case, with nothing coinciding
+            return [positions]
+        round_order = np.argsort(occurrences, kind="stable")
+        round_ends = np.cumsum(np.bincount(occurrences))
+        return np.split(round_order, round_ends[:-1])
 
     def display_multiple_image_mobjects(self, image_mobjects, pixel_array):
         for image_mobject in image_mobjects:
             self.display_image_mobject(image_mobject, pixel_array)
 
     def display_image_mobject(self, image_mobject, pixel_array):
-        corner_coords = self.points_to_pixel_coords(
+        corner_coords = self.points_to_pixel_float_coords(
             image_mobject, image_mobject.points
         )
-        ul_coords, ur_coords, dl_coords = corner_coords
+        texture = self.get_image_mobject_texture(image_mobject, corner_coords)
+        self.display_texture(texture, corner_coords, pixel_array)
+
+    def get_image_mobject_texture(self, image_mobject, corner_coords):
+        """
+        Returns the image's pixels resampled to their on-screen size,
+        premultiplied by alpha and surrounded by a one pixel wide
+        transparent border, as expected by display_texture.  This is
+        reused between frames as long as neither the on-screen size
+        nor the image's pixels change.
+        """
+        pixel_width, pixel_height = self.get_texture_size(corner_coords)
+        source = image_mobject.get_pixel_array()
+        version = image_mobject.get_pixel_array_version()
+        key = (version, pixel_width, pixel_height)
+        cached = self.image_mobject_to_texture.get(image_mobject, None)
+        if version is not None and cached is not None:
+            cached_source, cached_key, cached_texture = cached
+            if cached_source is source and cached_key == key:
+                return cached_texture
+        texture = self.make_texture(
+            image_mobject.get_mipmap_levels(), pixel_width, pixel_height
+        )
+        if version is not None:
+            self.image_mobject_to_texture[image_mobject] = (source, key, texture)
+        return texture
+
+    def get_texture_size(self, corner_coords):
+        ul_coords, ur_coords, dl_coords = corner_coords[:3]
+        pixel_width = max(int(round(get_norm(ur_coords - ul_coords))), 1)
+        pixel_height = max(int(round(get_norm(dl_coords - ul_coords))), 1)
+        return pixel_width, pixel_height
+
+    def make_texture(self, mipmap_levels, pixel_width, pixel_height):
+        # Resample from the smallest mipmap level
+        # still at least as large as the target
+        large_enough_levels = [
+            level for level in mipmap_levels
+            if level.shape[0] >= pixel_height and level.shape[1] >= pixel_width
+        ]
+        if large_enough_levels:
+            source_level = large_enough_levels[-1]
+        else:
+            source_level = mipmap_levels[0]
+        resized = np.array(
+            Image.fromarray(source_level, mode="RGBA").resize(
+                (pixel_width, pixel_height), resample=Image.BICUBIC
+            ),
+            dtype='float32',
+        )
+        texture = np.zeros(
+            (pixel_height + 2, pixel_width + 2, 4), dtype='float32'
+        )
+        alphas = resized[:, :, 3:] / 255
+        texture[1:-1, 1:-1, :3] = resized[:, :, :3] * alphas
+        texture[1:-1, 1:-1, 3:] = alphas
+        return texture
+
+    def display_texture(self, texture, corner_coords, pixel_array):
+        """
+        Maps texture onto the parallelogram with the upper left,
+        upper right and lower left corners given by corner_coords,
+        in pixel coordinates, sampling only the pixels inside that
+        parallelogram's bounding box.
+        """
+        ul_coords, ur_coords, dl_coords = corner_coords[:3]
         right_vect = ur_coords - ul_coords
         down_vect = dl_coords - ul_coords
-        center_coords = ul_coords + (right_vect + down_vect) / 2
+        basis = np.array([right_vect, down_vect]).T
+        if np.linalg.det(basis) == 0:
+            return
+        all_corners = np.array([
+            ul_coords, ur_coords, dl_coords, ur_coords + down_vect
+        ])
+        ph, pw = pixel_array.shape[:2]
+        x0, y0 = np.maximum(np.floor(all_corners.min(0)), 0).astype(int)
+        x1, y1 = np.minimum(
+            np.ceil(all_corners.max(0)), [pw - 1, ph - 1]
+        ).astype(int)
+        if x0 > x1 or y0 > y1:
+            return
 
-        sub_image = Image.fromarray(
-            image_mobject.get_pixel_array(),
-            mode="RGBA"
+        # Find where the center of each pixel in the bounding box
+        # lands on the texture, whose border starts at 0 and whose
+        # inner pixel centers sit at 1, 2, ...
+        inverse = np.linalg.inv(basis)
+        xs = np.arange(x0, x1 + 1) + 0.5 - ul_coords[0]
+        ys = np.arange(y0, y1 + 1) + 0.5 - ul_coords[1]
+        tex_height, tex_width = texture.shape[:2]
+        us = inverse[0, 0] * xs[np.newaxis, :] + inverse[0, 1] * ys[:, np.newaxis]
+        vs = inverse[1, 0] * xs[np.newaxis, :] + inverse[1, 1] * ys[:, np.newaxis]
+        samples = get_bilinear_samples(
+            texture,
+            us * (tex_width - 2) + 0.5,
+            vs * (tex_height - 2) + 0.5,
         )
 
-        # Reshape
-        pixel_width = max(int(pdist([ul_coords, ur_coords])), 1)
-        pixel_height = max(int(pdist([ul_coords, dl_coords])), 1)
-        sub_image = sub_image.resize(
-            (pixel_width, pixel_height), resample=Image.BICUBIC
+        alphas = samples[:, :, 3]
+        new_array = np.zeros(samples.shape, dtype='uint8')
+        nonzero = alphas > 0
+        new_array[:, :, :3][nonzero] = np.clip(
+            samples[:, :, :3][nonzero] / alphas[nonzero][:, np.newaxis],
+            0, 255
         )
-
-        # Rotate
-        angle = angle_of_vector(right_vect)
-        adjusted_angle = -int(360 * angle / TAU)
-        if adjusted_angle != 0:
-            sub_image = sub_image.rotate(
-                adjusted_angle, resample=Image.BICUBIC, expand=1
-            )
-
-        # TODO, there is no accounting for a shear...
-
-        # Paste into an image as large as the camear's pixel array
-        full_image = Image.fromarray(
-            np.zeros((self.get_pixel_height(), self.get_pixel_width())),
-            mode="RGBA"
-        )
-        new_ul_coords = center_coords - np.array(sub_image.size) / 2
-        new_ul_coords = new_ul_coords.astype(int)
-        full_image.paste(
-            sub_image,
-            box=(
-                new_ul_coords[0],
-                new_ul_coords[1],
-                new_ul_coords[0] + sub_image.size[0],
-                new_ul_coords[1] + sub_image.size[1],
-            )
+        new_array[:, :, 3] = np.clip(255 * alphas, 0, 255)
+        alpha_composite_in_place(
+            pixel_array[y0:y1 + 1, x0:x1 + 1], new_array
         )
-        # Paint on top of existing pixel array
-        self.overlay_PIL_image(pixel_array, full_image)
 
-    def overlay_rgba_array(self, pixel_array, new_array):
-        self.overlay_PIL_image(
-            pixel_array,
-            self.get_image(new_array),
+    def overlay_rgba_array(self, pixel_array, new_array, bounding_box=None):
+        """
+        Composites new_array on top of pixel_array, in place, touching
+        only the pixels within bounding_box, given as inclusive
+        (x_min, y_min, x_max, y_max).  If bounding_box is None, it's
+        taken to be that of the pixels of new_array which aren't
+        fully transparent.
+        """
+        if bounding_box is None:
+            bounding_box = get_nonzero_alpha_bounding_box(new_array)
+            if bounding_box is None:
+                return
+        x0, y0, x1, y1 = bounding_box
+        alpha_composite_in_place(
+            pixel_array[y0:y1 + 1, x0:x1 + 1],
+            new_array[y0:y1 + 1, x0:x1 + 1],
         )
 
     def overlay_PIL_image(self, pixel_array, image):
-        pixel_array[:, :] = np.array(
-            Image.alpha_composite(
-                self.get_image(pixel_array),
-                image
-            ),
-            dtype='uint8'
-        )
+        self.overlay_rgba_array(pixel_array, np.array(image))
 
     def adjust_out_of_range_points(self, points):
         if not np.any(points > self.max_allowable_norm):
@@ -552,9 +1768,21 @@ class Camera(object):
         return points
 
     def points_to_pixel_coords(self, mobject, points):
+        return self.points_to_pixel_float_coords(
+            mobject, points
+        ).astype('int')
+
+    def points_to_pixel_float_coords(self, mobject, points):
         points = self.transform_points_pre_display(
             mobject, points
         )
+        return self.space_points_to_pixel_float_coords(points)
+
+    def space_points_to_pixel_float_coords(self, points):
+        """
+        Like points_to_pixel_float_coords, for points which have
+        already been through transform_points_pre_display
+        """
         shifted_points = points - self.get_frame_center()
 
         result = np.zeros((len(points), 2))
@@ -571,7 +1799,7 @@ class Camera(object):
 
         result[:, 0] = shifted_points[:, 0] * width_mult + width_add
         result[:, 1] = shifted_points[:, 1] * height_mult + height_add
-        return result.astype('int')
+        return result
 
     def on_screen_pixels(self, pixel_coords):
         return reduce(op.and_, [
@@ -648,12 +1876,35 @@ class BackgroundColoredVMobjectDisplayer(object):
     def __init__(self, camera):
         self.camera = camera
         self.file_name_to_pixel_array_map = {}
-        self.pixel_array = np.array(camera.get_pixel_array())
-        self.reset_pixel_array()
+        self.init_pixel_arrays()
+
+    def init_pixel_arrays(self):
+        # Both arrays persist between calls, and are kept at zero
+        # everywhere outside the bounding box last drawn into
+        self.pixel_array = np.zeros_like(self.camera.get_pixel_array())
+        self.result_array = np.zeros_like(self.pixel_array)
+        self.result_bounding_box = None
+
+    def match_camera_pixel_shape(self):
+        camera_shape = self.camera.get_pixel_array().shape
+        if self.pixel_array.shape == camera_shape:
+            return
+        # The camera caches cairo contexts by id, which a new
+        # array could otherwise end up reusing
+        self.camera.forget_cairo_contexts(self.pixel_array)
+        self.file_name_to_pixel_array_map = {}
+        self.init_pixel_arrays()
 
     def reset_pixel_array(self):
         self.pixel_array[:, :] = 0
 
+    def reset_result_array(self):
+        if self.result_bounding_box is None:
+            return
+        x0, y0, x1, y1 = self.result_bounding_box
+        self.result_array[y0:y1 + 1, x0:x1 + 1] = 0
+        self.result_bounding_box = None
+
     def resize_background_array(
         self, background_array,
         new_width, new_height,
@@ -685,24 +1936,61 @@ class BackgroundColoredVMobjectDisplayer(object):
         self.file_name_to_pixel_array_map[file_name] = back_array
         return back_array
 
-    def display(self, *cvmobjects):
-        batch_image_file_pairs = batch_by_property(
-            cvmobjects, lambda cv: cv.get_background_image_file()
+    def get_bounding_box(self, cvmobjects, get_pixel_bounding_boxes=None):
+        """
+        Union of the pixel bounding boxes of cvmobjects, as inclusive
+        (x_min, y_min, x_max, y_max), or None if none are on screen
+        """
+        if get_pixel_bounding_boxes is None:
+            get_pixel_bounding_boxes = self.camera.get_mobject_pixel_bounding_boxes
+        boxes = get_pixel_bounding_boxes(cvmobjects)
+        boxes = np.array([box for box in boxes if box is not None])
+        if len(boxes) == 0:
+            return None
+        return (
+            boxes[:, 0].min(), boxes[:, 1].min(),
+            boxes[:, 2].max(), boxes[:, 3].max(),
+        )
+
+    def display(self, *cvmobjects, bounding_box=None):
+        """
+        Returns a frame sized array holding cvmobjects colored by their
+        background images.  Only the pixels within bounding_box, which
+        defaults to that of all cvmobjects, are ever touched, and all
+        others are left at zero.
+        """
+        if bounding_box is None:
+            bounding_box = self.get_bounding_box(cvmobjects)
+        return self.display_batches(
+            batch_by_property(
+                cvmobjects, lambda cv: cv.get_background_image_file()
+            ),
+            bounding_box,
+            self.camera.display_multiple_non_background_colored_vmobjects,
         )
-        curr_array = None
+
+    def display_batches(self, batch_image_file_pairs, bounding_box, display_batch):
+        """
+        Each batch is drawn by display_batch(batch, pixel_array),
+        then colored by the image named alongside it
+        """
+        self.match_camera_pixel_shape()
+        self.reset_result_array()
+        if bounding_box is None:
+            return self.result_array
+        x0, y0, x1, y1 = bounding_box
+        scratch = self.pixel_array[y0:y1 + 1, x0:x1 + 1]
+        result = self.result_array[y0:y1 + 1, x0:x1 + 1]
+        self.result_bounding_box = bounding_box
+
         for batch, image_file in batch_image_file_pairs:
             background_array = self.get_background_array(image_file)
-            pixel_array = self.pixel_array
-            self.camera.display_multiple_non_background_colored_vmobjects(
-                batch, pixel_array
-            )
-            new_array = np.array(
-                (background_array * pixel_array.astype('float') / 255),
-                dtype=self.camera.pixel_array_dtype
-            )
-            if curr_array is None:
-                curr_array = new_array
-            else:
-                curr_array = np.maximum(curr_array, new_array)
-            self.reset_pixel_array()
-        return curr_array
+            display_batch(batch, self.pixel_array)
+            # Products of two bytes fit in 16 bits, and floor dividing
+            # matches the float computation this replaced exactly
+            new_array = background_array[y0:y1 + 1, x0:x1 + 1].astype('uint16')
+            new_array *= scratch
+            new_array //= 255
+            np.maximum(result, new_array, out=result, casting="unsafe")
+            scratch[:] = 0
+        return self.result_array
@@ -0,0 +1,462 @@
+"""
+Display lists, and a binary format for saving and sending them.
+
+A serialized display list (see display_list_to_bytes) is laid out as
+
+    magic       8 bytes, b"MANIMDL\\0"
+    version     uint32, little endian, DISPLAY_LIST_FORMAT_VERSION
+    header_len  uint64, little endian
+    header      header_len bytes of utf-8 json
+    arrays      each starting at a multiple of 64 bytes from the
+                start of the data
+
+The header holds the frame geometry ("pixel_shape", "frame_center",
+"frame_width", "frame_height"), "background_image_files", mapping the
+index of a vectorized item to its background image file, and "arrays",
+mapping each array's name to its "offset", "dtype" and "shape".  Those
+arrays are
+
+    points              float64 (n, 3), all points of all items
+    rgbas               float64 (n, 4), all colors of all items
+    items               int64 (n, 2), kind (0 for vectorized, 1 for
+                        point cloud, 2 for image, 3 for surface mesh)
+                        and index into the table for that kind, in
+                        drawing order
+    subpaths            int64 (n, 3), points start, end and closedness
+    vectorized          int64 (n, 9), subpaths start and end, fill,
+                        stroke and background stroke rgbas starts and
+                        ends, and the start of two gradient points
+    vectorized_widths   float64 (n, 2), stroke, background stroke width
+    point_clouds        int64 (n, 4), points start, end, rgbas start, end
+    point_cloud_widths  float64 (n,), stroke widths
+    images              int64 (n, 4), start of three corner points,
+                        start and end of its mipmap levels, and its
+                        mipmap key, or -1 if it has none
+    level_<k>           uint8 (height, width, 4), the k-th mipmap level
+    surface_meshes      int64 (n, 6), points start and end, four per
+                        face, and fill and stroke rgbas starts and ends,
+                        two per face
+    surface_mesh_widths float64 (n,), stroke widths
+
+Images whose mipmap keys are among the shared_mipmap_keys passed to
+display_list_to_bytes are written without their mipmap levels, which
+have to be passed separately to display_list_from_bytes.
+
+All ranges are half open.  Loading a display list from bytes or a
+memory mapped file gives items whose arrays are views into that data.
+"""
+import json
+import mmap
+import numpy as np
+
+
+class DisplayList(object):
+    """
+    Everything a Camera draws for one frame, as plain arrays, in the
+    order it's drawn.  Points are in space coordinates, but have already
+    been through the recording camera's transform_points_pre_display,
+    and colors have already been through its shading, so replaying a
+    display list (see Camera.capture_display_list) never looks at any
+    mobjects, and can happen in another process.
+    """
+
+    def __init__(self, pixel_shape, frame_center, frame_width, frame_height, items=None):
+        self.pixel_height, self.pixel_width = map(int, pixel_shape)
+        self.frame_center = np.array(frame_center, dtype='float')
+        self.frame_width = float(frame_width)
+        self.frame_height = float(frame_height)
+        self.items = list(items or [])
+
+    def add_item(self, item):
+        self.items.append(item)
+        return self
+
+    def get_items(self):
+        return self.items
+
+    def __len__(self):
+        return len(self.items)
+
+
+class VectorizedDisplayItem(object):
+    def __init__(self, subpaths, closed,
+                 fill_rgbas, stroke_rgbas, stroke_width,
+                 background_stroke_rgbas, background_stroke_width,
+                 gradient_points, background_image_file=None):
+        # subpaths is a list of arrays of bezier control points, the
+        # first being the vmobject's own and the rest those of its
+        # subpath mobjects, with closed a list of matching booleans
+        self.subpaths = subpaths
+        self.closed = closed
+        self.fill_rgbas = fill_rgbas
+        self.stroke_rgbas = stroke_rgbas
+        self.stroke_width = stroke_width
+        self.background_stroke_rgbas = background_stroke_rgbas
+        self.background_stroke_width = background_stroke_width
+        self.gradient_points = gradient_points
+        self.background_image_file = background_image_file
+
+    def get_stroke_width(self, background=False):
+        if background:
+            return self.background_stroke_width
+        return self.stroke_width
+
+    def get_stroke_rgbas(self, background=False):
+        if background:
+            return self.background_stroke_rgbas
+        return self.stroke_rgbas
+
+    def get_all_points(self):
+        return np.vstack(self.subpaths)
+
+
+class PointCloudDisplayItem(object):
+    def __init__(self, points, rgbas, stroke_width):
+        self.points = points
+        self.rgbas = rgbas
+        self.stroke_width = stroke_width
+
+    def get_all_points(self):
+        return self.points
+
+
+class ImageDisplayItem(object):
+    def __init__(self, corner_points, mipmap_levels, mipmap_key=None):
+        # Upper left, upper right and lower left corners
+        self.corner_points = corner_points
+        # Full resolution pixel array first, then ever smaller
+        # versions of it, as in AbstractImageMobject.get_mipmap_levels
+        self.mipmap_levels = mipmap_levels
+        # As in AbstractImageMobject.get_mipmap_key
+        self.mipmap_key = mipmap_key
+
+    def get_all_points(self):
+        ul, ur, dl = self.corner_points[:3]
+        return np.vstack([self.corner_points, [ur + dl - ul]])
+
+
+class SurfaceMeshDisplayItem(object):
+    def __init__(self, corner_points, fill_rgbas, stroke_rgbas, stroke_width):
+        # corner_points is an (n_faces, 4, 3) array, with faces in the
+        # order they're drawn, and the rgbas (n_faces, 2, 4) arrays of
+        # the colors at the first and third corner of each face
+        self.corner_points = corner_points
+        self.fill_rgbas = fill_rgbas
+        self.stroke_rgbas = stroke_rgbas
+        self.stroke_width = stroke_width
+
+    def get_all_points(self):
+        return self.corner_points.reshape((-1, 3))
+
+
+DISPLAY_LIST_MAGIC = b"MANIMDL\0"
+DISPLAY_LIST_FORMAT_VERSION = 1
+DISPLAY_LIST_ALIGNMENT = 64
+
+VECTORIZED_KIND = 0
+POINT_CLOUD_KIND = 1
+IMAGE_KIND = 2
+SURFACE_MESH_KIND = 3
+
+
+def display_list_to_bytes(display_list, shared_mipmap_keys=()):
+    """
+    Images whose mipmap keys are in shared_mipmap_keys are written
+    without their mipmap levels, which the reader is expected to
+    already have.
+    """
+    points = []
+    rgbas = []
+    counts = {"points": 0, "rgbas": 0}
+
+    def add(name, arrays, array):
+        array = np.asarray(array, dtype='float64').reshape(
+            (-1, 3 if name == "points" else 4)
+        )
+        start = counts[name]
+        arrays.append(array)
+        counts[name] += len(array)
+        return [start, counts[name]]
+
+    tables = dict([(key, []) for key in [
+        "items", "subpaths", "vectorized", "vectorized_widths",
+        "point_clouds", "point_cloud_widths", "images",
+        "surface_meshes", "surface_mesh_widths",
+    ]])
+    levels = []
+    background_image_files = {}
+    for item in display_list.get_items():
+        if isinstance(item, VectorizedDisplayItem):
+            index = len(tables["vectorized"])
+            tables["items"].append([VECTORIZED_KIND, index])
+            subpaths_start = len(tables["subpaths"])
+            for subpath, closed in zip(item.subpaths, item.closed):
+                tables["subpaths"].append(
+                    add("points", points, subpath) + [int(closed)]
+                )
+            tables["vectorized"].append(
+                [subpaths_start, len(tables["subpaths"])] +
+                add("rgbas", rgbas, item.fill_rgbas) +
+                add("rgbas", rgbas, item.stroke_rgbas) +
+                add("rgbas", rgbas, item.background_stroke_rgbas) +
+                add("points", points, item.gradient_points)[:1]
+            )
+            tables["vectorized_widths"].append([
+                item.stroke_width, item.background_stroke_width
+            ])
+            if item.background_image_file:
+                background_image_files[str(index)] = item.background_image_file
+        elif isinstance(item, PointCloudDisplayItem):
+            tables["items"].append([POINT_CLOUD_KIND, len(tables["point_clouds"])])
+            tables["point_clouds"].append(
+                add("points", points, item.points) +
+                add("rgbas", rgbas, item.rgbas)
+            )
+            tables["point_cloud_widths"].append(item.stroke_width)
+        elif isinstance(item, ImageDisplayItem):
+            tables["items"].append([IMAGE_KIND, len(tables["images"])])
+            if item.mipmap_key is None:
+                mipmap_key = -1
+            else:
+                mipmap_key = item.mipmap_key
+            if item.mipmap_key in shared_mipmap_keys:
+                item_levels = []
+            else:
+                item_levels = item.mipmap_levels
+            tables["images"].append(
+                add("points", points, item.corner_points[:3])[:1] +
+                [len(levels), len(levels) + len(item_levels), mipmap_key]
+            )
+            levels += item_levels
+        elif isinstance(item, SurfaceMeshDisplayItem):
+            tables["items"].append([
+                SURFACE_MESH_KIND, len(tables["surface_meshes"])
+            ])
+            tables["surface_meshes"].append(
+                add("points", points, item.corner_points) +
+                add("rgbas", rgbas, item.fill_rgbas) +
+                add("rgbas", rgbas, item.stroke_rgbas)
+            )
+            tables["surface_mesh_widths"].append(item.stroke_width)
+        else:
+            raise Exception("Unknown display item type %s" % type(item))
+
+    arrays = [
+        # All already two dimensional
+        ("points", np.concatenate(points or [np.zeros((0, 3))])),
+        ("rgbas", np.concatenate(rgbas or [np.zeros((0, 4))])),
+    ]
+    widths = {
+        "items": 2, "subpaths": 3, "vectorized": 9, "vectorized_widths": 2,
+        "point_clouds": 4, "point_cloud_widths": None, "images": 4,
+        "surface_meshes": 6, "surface_mesh_widths": None,
+    }
+    for name, width in widths.items():
+        dtype = 'float64' if name.endswith("widths") else 'int64'
+        shape = (len(tables[name]),) + ((width,) if width else ())
+        arrays.append((name, np.array(tables[name], dtype=dtype).reshape(shape)))
+    for k, level in enumerate(levels):
+        arrays.append(("level_%d" % k, np.array(level, dtype='uint8')))
+
+    # Array offsets depend on the header's length, and vice versa,
+    # so offsets are first computed relative to the array section
+    array_specs = {}
+    offset = 0
+    for name, array in arrays:
+        array_specs[name] = {
+            "offset": offset,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+        offset += get_aligned_length(array.nbytes)
+    header = {
+        "pixel_shape": [display_list.pixel_height, display_list.pixel_width],
+        "frame_center": list(map(float, display_list.frame_center)),
+        "frame_width": display_list.frame_width,
+        "frame_height": display_list.frame_height,
+        "background_image_files": background_image_files,
+        "arrays": array_specs,
+    }
+    # Leave room for the offsets themselves to grow the header
+    header_bytes = json.dumps(header).encode()
+    data_start = get_aligned_length(20 + len(header_bytes) + 16 * len(arrays))
+    for spec in array_specs.values():
+        spec["offset"] += data_start
+    header_bytes = json.dumps(header).encode()
+    assert(20 + len(header_bytes) <= data_start)
+
+    result = bytearray(data_start + offset)
+    result[:8] = DISPLAY_LIST_MAGIC
+    result[8:12] = np.uint32(DISPLAY_LIST_FORMAT_VERSION).astype('<u4').tobytes()
+    result[12:20] = np.uint64(len(header_bytes)).astype('<u8').tobytes()
+    result[20:20 + len(header_bytes)] = header_bytes
+    for name, array in arrays:
+        start = array_specs[name]["offset"]
+        result[start:start + array.nbytes] = np.ascontiguousarray(array).tobytes()
+    return bytes(result)
+
+
+def get_aligned_length(length):
+    alignment = DISPLAY_LIST_ALIGNMENT
+    return alignment * ((length + alignment - 1) // alignment)
+
+
+def display_list_from_bytes(data, mipmap_key_to_levels=None):
+    """
+    data can be anything supporting the buffer protocol, like bytes
+    or an mmap, and the arrays of the returned display list are
+    read-only views into it.  Images written without their mipmap
+    levels get them from mipmap_key_to_levels.
+    """
+    data = memoryview(data)
+    if bytes(data[:8]) != DISPLAY_LIST_MAGIC:
+        raise Exception("Not a serialized display list")
+    version = int(np.frombuffer(data, dtype='<u4', count=1, offset=8)[0])
+    if version != DISPLAY_LIST_FORMAT_VERSION:
+        raise Exception(
+            "Display list has format version %d, expected %d" % (
+                version, DISPLAY_LIST_FORMAT_VERSION
+            )
+        )
+    header_len = int(np.frombuffer(data, dtype='<u8', count=1, offset=12)[0])
+    header = json.loads(bytes(data[20:20 + header_len]).decode())
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape))
+        if count == 0:
+            arrays[name] = np.zeros(shape, dtype=spec["dtype"])
+        else:
+            arrays[name] = np.frombuffer(
+                data, dtype=spec["dtype"],
+                count=count, offset=spec["offset"],
+            ).reshape(shape)
+
+    points = arrays["points"]
+    rgbas = arrays["rgbas"]
+    items = []
+    for kind, index in arrays["items"].tolist():
+        if kind == VECTORIZED_KIND:
+            (s0, s1, f0, f1, st0, st1, b0, b1, g0) = arrays["vectorized"][index].tolist()
+            subpaths = arrays["subpaths"][s0:s1].tolist()
+            stroke_width, background_stroke_width = arrays["vectorized_widths"][index]
+            items.append(VectorizedDisplayItem(
+                subpaths=[points[p0:p1] for p0, p1, closed in subpaths],
+                closed=[bool(closed) for p0, p1, closed in subpaths],
+                fill_rgbas=rgbas[f0:f1],
+                stroke_rgbas=rgbas[st0:st1],
+                stroke_width=float(stroke_width),
+                background_stroke_rgbas=rgbas[b0:b1],
+                background_stroke_width=float(background_stroke_width),
+                gradient_points=points[g0:g0 + 2],
+                background_image_file=header["background_image_files"].get(
+                    str(index), None
+                ),
+            ))
+        elif kind == POINT_CLOUD_KIND:
+            p0, p1, r0, r1 = arrays["point_clouds"][index].tolist()
+            items.append(PointCloudDisplayItem(
+                points[p0:p1], rgbas[r0:r1],
+                float(arrays["point_cloud_widths"][index]),
+            ))
+        elif kind == IMAGE_KIND:
+            c0, l0, l1, mipmap_key = arrays["images"][index].tolist()
+            if mipmap_key < 0:
+                mipmap_key = None
+            if l0 < l1:
+                mipmap_levels = [arrays["level_%d" % k] for k in range(l0, l1)]
+            elif mipmap_key in (mipmap_key_to_levels or {}):
+                mipmap_levels = mipmap_key_to_levels[mipmap_key]
+            else:
+                raise Exception(
+                    "No mipmap levels for image with key %s" % mipmap_key
+                )
+            items.append(ImageDisplayItem(
+                points[c0:c0 + 3], mipmap_levels, mipmap_key,
+            ))
+        elif kind == SURFACE_MESH_KIND:
+            p0, p1, f0, f1, s0, s1 = arrays["surface_meshes"][index].tolist()
+            items.append(SurfaceMeshDisplayItem(
+                points[p0:p1].reshape((-1, 4, 3)),
+                rgbas[f0:f1].reshape((-1, 2, 4)),
+                rgbas[s0:s1].reshape((-1, 2, 4)),
+                float(arrays["surface_mesh_widths"][index]),
+            ))
+        else:
+            raise Exception("Unknown display item kind %d" % kind)
+    return DisplayList(
+        header["pixel_shape"],
+        header["frame_center"],
+        header["frame_width"],
+        header["frame_height"],
+        items,
+    )
+
+
+def save_display_list(display_list, file_path):
+    with open(file_path, "wb") as outfile:
+        outfile.write(display_list_to_bytes(display_list))
+
+
+def load_display_list(file_path, use_mmap=True):
+    with open(file_path, "rb") as infile:
+        if use_mmap:
+            # The mapping stays open for as long as the
+            # arrays viewing it are around
+            data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = infile.read()
+    return display_list_from_bytes(data)
+
+
+def get_display_list_differences(display_list1, display_list2, atol=1e-8):
+    """
+    Returns a list of descriptions of how two display lists
+    differ, which is empty if they'd draw the same thing.
+    """
+    differences = []
+    for attr in ["pixel_height", "pixel_width", "frame_width", "frame_height"]:
+        value1 = getattr(display_list1, attr)
+        value2 = getattr(display_list2, attr)
+        if value1 != value2:
+            differences.append("%s: %s != %s" % (attr, value1, value2))
+    if not np.allclose(display_list1.frame_center, display_list2.frame_center, atol=atol):
+        differences.append("frame_center: %s != %s" % (
+            display_list1.frame_center, display_list2.frame_center
+        ))
+    items1 = display_list1.get_items()
+    items2 = display_list2.get_items()
+    if len(items1) != len(items2):
+        differences.append("Number of items: %d != %d" % (
+            len(items1), len(items2)
+        ))
+    for index, (item1, item2) in enumerate(zip(items1, items2)):
+        if type(item1) != type(item2):
+            differences.append("Item %d: %s != %s" % (
+                index, type(item1).__name__, type(item2).__name__
+            ))
+            continue
+        for attr, value1 in sorted(item1.__dict__.items()):
+            value2 = getattr(item2, attr)
+            if not values_match(value1, value2, atol):
+                differences.append("Item %d (%s): %s differs" % (
+                    index, type(item1).__name__, attr
+                ))
+    return differences
+
+
+def values_match(value1, value2, atol):
+    if isinstance(value1, list):
+        return isinstance(value2, list) and len(value1) == len(value2) and all([
+            values_match(v1, v2, atol)
+            for v1, v2 in zip(value1, value2)
+        ])
+    if isinstance(value1, np.ndarray) or isinstance(value2, np.ndarray):
+        value1 = np.asarray(value1)
+        value2 = np.asarray(value2)
+        if value1.shape != value2.shape:
+            return False
+        if value1.dtype.kind in "fc" or value2.dtype.kind in "fc":
+            return np.allclose(value1, value2, atol=atol)
+        return np.array_equal(value1, value2)
+    return value1 == value2
@@ -1,6 +1,7 @@
 
 
 import numpy as np
+import weakref
 
 from camera.camera import Camera
 from mobject.types.vectorized_mobject import VMobject
@@ -14,28 +15,111 @@ from utils.config_ops import digest_config
 class MappingCamera(Camera):
     CONFIG = {
         "mapping_func": lambda p: p,
+        # If not None, this is used in place of mapping_func, and
+        # should map a whole (N, 3) array of points at once
+        "points_mapping_func": None,
         "min_anchor_points": 50,
         "allow_object_intrusion": False
     }
 
-    def points_to_pixel_coords(self, points):
-        return Camera.points_to_pixel_coords(self, np.apply_along_axis(self.mapping_func, 1, points))
+    def __init__(self, *args, **kwargs):
+        Camera.__init__(self, *args, **kwargs)
+        # Densified copies of vmobjects with too few anchor points,
+        # along with the points they were made from
+        self.densified_copies = weakref.WeakKeyDictionary()
+        self.is_capturing_frame = False
+        self.mapped_points = dict()
+
+    def map_points(self, points):
+        points = np.array(points)
+        if len(points) == 0:
+            return points
+        if self.points_mapping_func is not None:
+            return np.array(self.points_mapping_func(points))
+        return np.apply_along_axis(self.mapping_func, 1, points)
+
+    def transform_points_pre_display(self, mobject, points):
+        # The same points are asked for a few times per frame,
+        # for bounding boxes, batching and paths
+        mapped = self.mapped_points.get(mobject)
+        if mapped is not None and mapped[0] is points:
+            return mapped[1]
+        result = self.map_points(points)
+        if self.is_capturing_frame and points is mobject.points:
+            self.mapped_points[mobject] = (points, result)
+        return result
 
     def capture_mobjects(self, mobjects, **kwargs):
-        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        self.start_frame()
+        try:
+            Camera.capture_mobjects(
+                self, self.get_mobjects_to_capture(mobjects, **kwargs),
+                include_submobjects=False,
+                excluded_mobjects=None,
+            )
+        finally:
+            self.end_frame()
+
+    def get_display_list(self, mobjects, **kwargs):
+        self.start_frame()
+        try:
+            return Camera.get_display_list(
+                self, self.get_mobjects_to_capture(mobjects, **kwargs),
+                include_submobjects=False,
+                excluded_mobjects=None,
+            )
+        finally:
+            self.end_frame()
+
+    def start_frame(self):
+        self.is_capturing_frame = True
+
+    def end_frame(self):
+        # Points may change in place before the next frame
+        self.is_capturing_frame = False
+        self.mapped_points = dict()
+
+    def get_mobjects_to_capture(self, mobjects, **kwargs):
+        return [
+            self.get_densified_mobject(mobject)
+            if self.needs_densifying(mobject) else mobject
+            for mobject in self.get_mobjects_to_display(mobjects, **kwargs)
+        ]
+
+    def needs_densifying(self, mobject):
+        if not isinstance(mobject, VMobject) or mobject.is_subpath:
+            return False
+        n_anchors = mobject.get_num_anchor_points()
+        return 0 < n_anchors < self.min_anchor_points
+
+    def get_densified_mobject(self, vmobject):
+        """
+        Returns a version of vmobject with at least min_anchor_points
+        anchor points, so that its curves bend along with the mapping.
+        Unless allow_object_intrusion is True, this is a copy, which is
+        reused until vmobject's points change.
+        """
         if self.allow_object_intrusion:
-            mobject_copies = mobjects
+            vmobject.insert_n_anchor_points(self.min_anchor_points)
+            return vmobject
+        family_points = [mob.points for mob in vmobject.get_family()]
+        cached = self.densified_copies.get(vmobject, None)
+        if cached is not None and len(cached[0]) == len(family_points) and all([
+            np.array_equal(points1, points2)
+            for points1, points2 in zip(cached[0], family_points)
+        ]):
+            densified = cached[1]
+            # Only points were cached, the style may have changed since
+            densified.match_style(vmobject)
+            densified.background_image_file = vmobject.background_image_file
         else:
-            mobject_copies = [mobject.copy() for mobject in mobjects]
-        for mobject in mobject_copies:
-            if isinstance(mobject, VMobject) and \
-                    0 < mobject.get_num_anchor_points() < self.min_anchor_points:
-                mobject.insert_n_anchor_points(self.min_anchor_points)
-        Camera.capture_mobjects(
-            self, mobject_copies,
-            include_submobjects=False,
-            excluded_mobjects=None,
-        )
+            densified = vmobject.copy()
+            densified.insert_n_anchor_points(self.min_anchor_points)
+            self.densified_copies[vmobject] = (
+                [np.array(points) for points in family_points],
+                densified,
+            )
+        return densified
 
 # Note: This allows layering of multiple cameras onto the same portion of the pixel array,
 # the later cameras overwriting the former
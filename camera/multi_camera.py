@@ -1,7 +1,4 @@
-
-
 from camera.moving_camera import MovingCamera
-from utils.iterables import list_difference_update
 
 
 class MultiCamera(MovingCamera):
@@ -25,6 +22,9 @@ class MultiCamera(MovingCamera):
     def update_sub_cameras(self):
         """ Reshape sub_camera pixel_arrays """
         for imfc in self.image_mobjects_from_cameras:
+            # Cached paths are keyed on the points they were built
+            # from, so they can be shared, as with start_frame
+            imfc.camera.vmobject_to_cairo_path = self.vmobject_to_cairo_path
             pixel_height, pixel_width = self.get_pixel_array().shape[:2]
             imfc.camera.frame_shape = (
                 imfc.camera.frame.get_height(),
@@ -43,14 +43,68 @@ class MultiCamera(MovingCamera):
 
     def capture_mobjects(self, mobjects, **kwargs):
         self.update_sub_cameras()
+        # Family members are found just once for all cameras
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        self.start_frame()
+        try:
+            self.capture_mobjects_in_sub_cameras(mobjects)
+            MovingCamera.capture_mobjects(
+                self, mobjects,
+                include_submobjects=False,
+                excluded_mobjects=None,
+            )
+        finally:
+            self.end_frame()
+
+    def get_display_list(self, mobjects, **kwargs):
+        """
+        The sub-cameras are drawn here and now, so that the images
+        from them recorded in the display list are up to date.
+        """
+        self.update_sub_cameras()
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        self.start_frame()
+        try:
+            self.capture_mobjects_in_sub_cameras(mobjects)
+            return MovingCamera.get_display_list(
+                self, mobjects,
+                include_submobjects=False,
+                excluded_mobjects=None,
+            )
+        finally:
+            self.end_frame()
+
+    def start_frame(self):
+        """
+        Cairo paths are in space coordinates, which MovingCameras draw
+        without transforming, so all cameras can share the paths built
+        for a frame, along with the batch keys used to merge them.
+        Mobjects are keyed by id, which only holds within one frame.
+        """
+        self.frame_batch_keys = dict()
+        self.frame_batch_paths = dict()
+        for imfc in self.image_mobjects_from_cameras:
+            imfc.camera.frame_batch_keys = self.frame_batch_keys
+            imfc.camera.frame_batch_paths = self.frame_batch_paths
+
+    def end_frame(self):
+        for camera in [self] + [imfc.camera for imfc in self.image_mobjects_from_cameras]:
+            camera.frame_batch_keys = None
+            camera.frame_batch_paths = None
+
+    def capture_mobjects_in_sub_cameras(self, mobjects):
+        """
+        mobjects should already be a list of family members.  Each
+        sub-camera draws them straight from the mobjects, culled to its
+        own frame, sharing this camera's cached paths, but keeping
+        its own textures, whose size depends on its resolution.
+        """
         for imfc in self.image_mobjects_from_cameras:
-            to_add = list(mobjects)
+            to_add = mobjects
             if not self.allow_cameras_to_capture_their_own_display:
-                to_add = list_difference_update(
-                    to_add, imfc.get_family()
-                )
-            imfc.camera.capture_mobjects(to_add, **kwargs)
-        MovingCamera.capture_mobjects(self, mobjects, **kwargs)
+                family_ids = set(map(id, imfc.get_family()))
+                to_add = [m for m in mobjects if id(m) not in family_ids]
+            imfc.camera.capture_mobjects(to_add, include_submobjects=False)
 
     def get_mobjects_indicating_movement(self):
         return [self.frame] + [
@@ -0,0 +1,66 @@
+import numpy as np
+
+from camera.camera import Camera
+
+
+class NullCamera(Camera):
+    """
+    Goes through the motions of capturing mobjects, but never draws
+    anything, only counting the mobjects and points it would have drawn.
+    Use get_null_camera_class to get a null version of another camera
+    class, which still picks which mobjects to display the way that
+    class would.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Cooperative, so that the __init__ of whichever
+        # camera class this is mixed into still gets called
+        super(NullCamera, self).__init__(*args, **kwargs)
+        self.reset_capture_counts()
+
+    def reset_capture_counts(self):
+        self.n_captures = 0
+        self.n_mobjects_captured = 0
+        self.n_points_captured = 0
+
+    def get_capture_counts(self):
+        return (self.n_captures, self.n_mobjects_captured, self.n_points_captured)
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        self.n_captures += 1
+        self.n_mobjects_captured += len(mobjects)
+        self.n_points_captured += sum([
+            mobject.get_num_points() for mobject in mobjects
+        ])
+
+    def init_background(self):
+        self.background = self.get_stand_in_pixel_array((
+            self.get_pixel_height(),
+            self.get_pixel_width(),
+            self.n_channels,
+        ))
+
+    def set_pixel_array(self, pixel_array, convert_from_floats=False):
+        # Nothing is ever drawn, so there's nothing to reset
+        if hasattr(self, "pixel_array") and self.pixel_array.shape == pixel_array.shape:
+            return
+        self.pixel_array = self.get_stand_in_pixel_array(pixel_array.shape)
+
+    def get_stand_in_pixel_array(self, shape):
+        """
+        A read-only array of the given shape, all zeros, which
+        takes up no more memory than a single pixel
+        """
+        pixel = np.zeros(shape[2:], dtype=self.pixel_array_dtype)
+        return np.broadcast_to(pixel, shape)
+
+
+def get_null_camera_class(camera_class):
+    if issubclass(camera_class, NullCamera):
+        return camera_class
+    return type(
+        "Null" + camera_class.__name__,
+        (NullCamera, camera_class),
+        {}
+    )
@@ -0,0 +1,172 @@
+from camera.display_list import DISPLAY_LIST_FORMAT_VERSION
+from camera.display_list import DisplayList
+from camera.display_list import ImageDisplayItem
+from camera.display_list import PointCloudDisplayItem
+from camera.display_list import SurfaceMeshDisplayItem
+from camera.display_list import VectorizedDisplayItem
+from camera.display_list import display_list_from_bytes
+from camera.display_list import display_list_to_bytes
+from camera.display_list import get_display_list_differences
+from camera.display_list import load_display_list
+from camera.display_list import save_display_list
+
+import numpy as np
+import pytest
+
+
+SEED = 386735
+np.random.seed(SEED)
+
+
+def get_display_list():
+    display_list = DisplayList((90, 160), [1, 2, 0], 14.2, 8)
+    display_list.add_item(VectorizedDisplayItem(
+        subpaths=[np.random.rand(7, 3), np.random.rand(4, 3)],
+        closed=[True, False],
+        fill_rgbas=np.random.rand(2, 4),
+        stroke_rgbas=np.random.rand(1, 4),
+        stroke_width=4,
+        background_stroke_rgbas=np.random.rand(1, 4),
+        background_stroke_width=0,
+        gradient_points=np.random.rand(2, 3),
+        background_image_file="background.png",
+    ))
+    display_list.add_item(PointCloudDisplayItem(
+        np.random.rand(10, 3), np.random.rand(10, 4), 2,
+    ))
+    display_list.add_item(ImageDisplayItem(
+        np.random.rand(3, 3),
+        [
+            np.random.randint(0, 256, (8, 6, 4)).astype('uint8'),
+            np.random.randint(0, 256, (4, 3, 4)).astype('uint8'),
+        ],
+    ))
+    display_list.add_item(SurfaceMeshDisplayItem(
+        np.random.rand(5, 4, 3), np.random.rand(5, 2, 4),
+        np.random.rand(5, 2, 4), 0.5,
+    ))
+    # Empty subpaths and colors
+    display_list.add_item(VectorizedDisplayItem(
+        subpaths=[np.zeros((0, 3))],
+        closed=[False],
+        fill_rgbas=np.zeros((0, 4)),
+        stroke_rgbas=np.zeros((0, 4)),
+        stroke_width=0,
+        background_stroke_rgbas=np.zeros((0, 4)),
+        background_stroke_width=0,
+        gradient_points=np.random.rand(2, 3),
+    ))
+    return display_list
+
+
+def test_display_list_round_trip():
+    display_list = get_display_list()
+    data = display_list_to_bytes(display_list)
+    assert data[:8] == b"MANIMDL\0"
+    loaded = display_list_from_bytes(data)
+    assert get_display_list_differences(display_list, loaded) == []
+    assert [type(item) for item in loaded.get_items()] == \
+        [type(item) for item in display_list.get_items()]
+    assert loaded.get_items()[0].background_image_file == "background.png"
+    assert loaded.get_items()[4].background_image_file is None
+
+    # Reserializing gives the same bytes
+    assert display_list_to_bytes(loaded) == data
+
+
+def test_display_list_round_trip_empty():
+    display_list = DisplayList((90, 160), [0, 0, 0], 14.2, 8)
+    loaded = display_list_from_bytes(display_list_to_bytes(display_list))
+    assert len(loaded) == 0
+    assert get_display_list_differences(display_list, loaded) == []
+
+
+def test_display_list_arrays_are_aligned_views():
+    data = display_list_to_bytes(get_display_list())
+    loaded = display_list_from_bytes(data)
+    # The start of the array of all points
+    points = loaded.get_items()[0].subpaths[0]
+    assert not points.flags.writeable
+    buffer_start = np.frombuffer(data, dtype='uint8').ctypes.data
+    assert (points.ctypes.data - buffer_start) % 64 == 0
+
+
+def test_load_display_list(tmpdir):
+    display_list = get_display_list()
+    file_path = str(tmpdir.join("frame.mdl"))
+    save_display_list(display_list, file_path)
+    for use_mmap in [True, False]:
+        loaded = load_display_list(file_path, use_mmap=use_mmap)
+        assert get_display_list_differences(display_list, loaded) == []
+    # Memory mapped read-only
+    loaded = load_display_list(file_path)
+    level = loaded.get_items()[2].mipmap_levels[0]
+    assert not level.flags.writeable
+    with pytest.raises(ValueError):
+        level[0, 0, 0] = 0
+
+
+def test_display_list_from_bytes_checks_header():
+    data = bytearray(display_list_to_bytes(get_display_list()))
+    with pytest.raises(Exception):
+        display_list_from_bytes(b"NOTADL\0\0" + bytes(data[8:]))
+    data[8:12] = np.uint32(DISPLAY_LIST_FORMAT_VERSION + 1).astype('<u4').tobytes()
+    with pytest.raises(Exception):
+        display_list_from_bytes(bytes(data))
+
+
+def test_get_display_list_differences():
+    display_list = get_display_list()
+    other = display_list_from_bytes(display_list_to_bytes(display_list))
+    assert get_display_list_differences(display_list, other) == []
+
+    other.get_items()[1].stroke_width = 3
+    other.frame_width = 10
+    differences = get_display_list_differences(display_list, other)
+    assert len(differences) == 2
+    assert "frame_width" in differences[0]
+    assert "Item 1" in differences[1] and "stroke_width" in differences[1]
+
+    # Within tolerance
+    other = DisplayList(
+        (90, 160), [1, 2, 0], 14.2, 8, display_list.get_items()
+    )
+    other.items[1] = PointCloudDisplayItem(
+        display_list.items[1].points + 1e-10,
+        display_list.items[1].rgbas,
+        display_list.items[1].stroke_width,
+    )
+    assert get_display_list_differences(display_list, other) == []
+
+    other.items = display_list.items[:]
+    other.items[1:3] = [display_list.items[2], display_list.items[1]]
+    assert get_display_list_differences(display_list, other) == [
+        "Item 1: PointCloudDisplayItem != ImageDisplayItem",
+        "Item 2: ImageDisplayItem != PointCloudDisplayItem",
+    ]
+
+    other.items = display_list.items[:-1]
+    differences = get_display_list_differences(display_list, other)
+    assert differences == ["Number of items: 5 != 4"]
+
+
+def test_display_list_shared_mipmap_levels():
+    levels = [np.random.randint(0, 256, (8, 6, 4)).astype('uint8')]
+    display_list = DisplayList((90, 160), [0, 0, 0], 14.2, 8)
+    display_list.add_item(ImageDisplayItem(np.random.rand(3, 3), levels, 7))
+    display_list.add_item(ImageDisplayItem(np.random.rand(3, 3), levels))
+
+    data = display_list_to_bytes(display_list)
+    loaded = display_list_from_bytes(data)
+    assert get_display_list_differences(display_list, loaded) == []
+    assert loaded.get_items()[0].mipmap_key == 7
+    assert loaded.get_items()[1].mipmap_key is None
+
+    # Written without the levels of the first
+    shared_data = display_list_to_bytes(display_list, {7: None})
+    assert len(shared_data) < len(data)
+    with pytest.raises(Exception):
+        display_list_from_bytes(shared_data)
+    loaded = display_list_from_bytes(shared_data, {7: levels})
+    assert loaded.get_items()[0].mipmap_levels is levels
+    assert get_display_list_differences(display_list, loaded) == []
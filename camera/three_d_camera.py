@@ -7,6 +7,7 @@ from constants import *
 from camera.camera import Camera
 from mobject.types.point_cloud_mobject import Point
 from mobject.types.vectorized_mobject import VMobject
+from mobject.three_dimensions import ThreeDVMobject
 from mobject.three_d_utils import get_3d_vmob_start_corner
 from mobject.three_d_utils import get_3d_vmob_start_corner_unit_normal
 from mobject.three_d_utils import get_3d_vmob_end_corner
@@ -48,10 +49,36 @@ class ThreeDCamera(Camera):
         self.fixed_orientation_mobjects = dict()
         self.fixed_in_frame_mobjects = set()
         self.reset_rotation_matrix()
+        self.is_capturing_frame = False
+        self.mobject_to_projected_points = dict()
+        self.projection_cache = None
+        self.mobject_to_shading_factors = dict()
+        self.shading_cache = None
 
     def capture_mobjects(self, mobjects, **kwargs):
+        self.start_frame()
+        try:
+            Camera.capture_mobjects(self, mobjects, **kwargs)
+        finally:
+            self.end_frame()
+
+    def get_display_list(self, mobjects, **kwargs):
+        self.start_frame()
+        try:
+            return Camera.get_display_list(self, mobjects, **kwargs)
+        finally:
+            self.end_frame()
+
+    def start_frame(self):
         self.reset_rotation_matrix()
-        Camera.capture_mobjects(self, mobjects, **kwargs)
+        self.is_capturing_frame = True
+
+    def end_frame(self):
+        # Points may well change in place before the next
+        # frame, so projections are only trusted within one
+        self.is_capturing_frame = False
+        self.mobject_to_projected_points = dict()
+        self.mobject_to_shading_factors = dict()
 
     def get_value_trackers(self):
         return [
@@ -72,6 +99,10 @@ class ThreeDCamera(Camera):
                 shaded_rgbas = rgbas.repeat(2, axis=0)
             else:
                 shaded_rgbas = np.array(rgbas[:2])
+            factors = self.mobject_to_shading_factors.get(vmobject)
+            if factors is not None:
+                shaded_rgbas[:, :3] += factors.reshape((2, 1))
+                return shaded_rgbas
             shaded_rgbas[0, :3] = get_shaded_rgb(
                 shaded_rgbas[0, :3],
                 get_3d_vmob_start_corner(vmobject),
@@ -97,22 +128,202 @@ class ThreeDCamera(Camera):
             vmobject, vmobject.get_fill_rgbas()
         )
 
+    def get_surface_mesh_rgbas(self, mesh):
+        fill_rgbas, stroke_rgbas = Camera.get_surface_mesh_rgbas(self, mesh)
+        if not self.should_apply_shading:
+            return fill_rgbas, stroke_rgbas
+        # Shaded just as the faces of a ParametricSurface would be, at
+        # their first and third corners
+        corners = mesh.get_face_corners()
+        corner_points = corners[:, [0, 2]]
+        factors = get_shading_factors(
+            corner_points,
+            get_unit_normals(
+                corners[:, [1, 3]] - corner_points,
+                corners[:, [3, 1]] - corner_points,
+            ),
+            self.light_source.points[0],
+        )
+        for rgbas in fill_rgbas, stroke_rgbas:
+            rgbas[:, :, :3] += factors[:, :, np.newaxis]
+        return fill_rgbas, stroke_rgbas
+
+    def get_surface_mesh_face_order(self, mesh):
+        # Back to front, by the same measure as get_z_keys
+        corners = mesh.get_face_corners()
+        centers = (corners.min(1) + corners.max(1)) / 2
+        z_keys = np.dot(centers, self.get_rotation_matrix().T)[:, 2]
+        return np.argsort(z_keys, kind="stable")
+
     def get_mobjects_to_display(self, *args, **kwargs):
         mobjects = Camera.get_mobjects_to_display(
             self, *args, **kwargs
         )
+        # Everything below works off of one array holding
+        # the points of all mobjects, rather than mobject by mobject
+        lengths = [len(mob.points) for mob in mobjects]
+        all_points = np.concatenate(
+            [mob.points for mob in mobjects] + [np.zeros((0, 3))]
+        )
+        if self.is_capturing_frame:
+            self.update_projected_points(mobjects, lengths, all_points)
+            self.update_shading_factors(mobjects, lengths, all_points)
+        z_keys = self.get_z_keys(mobjects, lengths, all_points)
+        # A stable sort, so that ties keep their order, as with sorted
+        return [mobjects[i] for i in np.argsort(z_keys, kind="stable")]
+
+    def get_z_keys(self, mobjects, lengths, all_points):
+        """
+        Assigns a number to each three dimensional mobject based on how
+        close its z_index_group's center is to the camera, and infinity
+        to everything else.  all_points should be the points of
+        mobjects stacked together, lengths their number of points.
+        """
+        z_keys = np.full(len(mobjects), np.inf)
+        to_shade = np.zeros(len(mobjects), dtype=bool)
+        # Those whose reference point depends on more
+        # than their own points
+        grouped_indices = []
+        for i, mob in enumerate(mobjects):
+            if not getattr(mob, "shade_in_3d", False):
+                continue
+            to_shade[i] = True
+            group = getattr(mob, "z_index_group", mob)
+            if group is not mob or mob.submobjects or not lengths[i]:
+                grouped_indices.append(i)
+        if not np.any(to_shade):
+            return z_keys
+        lengths = np.array(lengths, dtype=int)
+        starts = np.cumsum(lengths) - lengths
+        has_points = lengths > 0
+        centers = np.zeros((len(mobjects), 3))
+        mins = maxs = np.zeros((0, 3))
+        if np.any(has_points):
+            # Bounding box centers, as with get_center
+            mins = np.minimum.reduceat(all_points, starts[has_points])
+            maxs = np.maximum.reduceat(all_points, starts[has_points])
+            centers[has_points] = (mins + maxs) / 2
+
+        if grouped_indices:
+            mins_and_maxs_index = np.cumsum(has_points) - 1
+            mob_to_index = dict([
+                (id(mob), i) for i, mob in enumerate(mobjects)
+            ])
+            group_to_center = dict()
+        for i in grouped_indices:
+            group = getattr(mobjects[i], "z_index_group", mobjects[i])
+            if id(group) not in group_to_center:
+                family = group.family_members_with_points()
+                indices = [mob_to_index.get(id(m)) for m in family]
+                if None in indices:
+                    center = group.get_center()
+                elif len(indices) == 0:
+                    center = np.zeros(3)
+                else:
+                    indices = mins_and_maxs_index[indices]
+                    center = (
+                        mins[indices].min(0) + maxs[indices].max(0)
+                    ) / 2
+                group_to_center[id(group)] = center
+            centers[i] = group_to_center[id(group)]
         rot_matrix = self.get_rotation_matrix()
+        z_keys[to_shade] = np.dot(centers[to_shade], rot_matrix.T)[:, 2]
+        return z_keys
+
+    def update_projected_points(self, mobjects, lengths, all_points):
+        """
+        Projects the points of all mobjects at once, to be looked up by
+        transform_points_pre_display for the rest of the frame.  If
+        neither the camera nor any points have moved since the last
+        frame, its projection is reused.
+        """
+        cache_key = self.get_projection_cache_key()
+        cache = self.projection_cache
+        if cache is not None and cache[0] == cache_key and \
+                np.array_equal(cache[1], all_points):
+            projected = cache[2]
+        else:
+            projected = self.project_points(all_points)
+            self.projection_cache = (cache_key, np.array(all_points), projected)
+        self.mobject_to_projected_points = dict()
+        end = 0
+        for mob, length in zip(mobjects, lengths):
+            start, end = end, end + length
+            self.mobject_to_projected_points[mob] = (
+                mob.points, projected[start:end]
+            )
 
-        def z_key(mob):
-            if not (hasattr(mob, "shade_in_3d") and mob.shade_in_3d):
-                return np.inf
-            # Assign a number to a three dimensional mobjects
-            # based on how close it is to the camera
-            return np.dot(
-                mob.get_z_index_reference_point(),
-                rot_matrix.T
-            )[2]
-        return sorted(mobjects, key=z_key)
+    def update_shading_factors(self, mobjects, lengths, all_points):
+        """
+        Computes, for every ThreeDVMobject in mobjects at once, what
+        modified_rgbas adds to the colors of its start and end corners,
+        as get_shaded_rgb would, to be looked up for the rest of the
+        frame.  If neither the light source nor any of the points
+        involved have moved since the last frame, its factors are reused.
+        """
+        self.mobject_to_shading_factors = dict()
+        if not self.should_apply_shading:
+            return
+        indices = [
+            i for i, mob in enumerate(mobjects)
+            if isinstance(mob, ThreeDVMobject) and lengths[i] > 0
+        ]
+        if not indices:
+            return
+        lengths = np.array(lengths, dtype=int)
+        starts = (np.cumsum(lengths) - lengths)[indices]
+        n_points = lengths[indices]
+        # Columns for the start and end corners, as in three_d_utils
+        corner_indices = np.array([
+            np.zeros(len(n_points), dtype=int),
+            ((n_points - 1) // 6) * 3,
+        ]).T
+        n_points = n_points.reshape((len(n_points), 1))
+        # Only meaningful with more than two anchors, otherwise
+        # the unit normal is UP
+        has_normal = (n_points > 6)
+        prev_indices = np.where(
+            corner_indices > 2, corner_indices - 3, n_points - 4,
+        )
+        next_indices = np.where(
+            corner_indices < n_points - 3, corner_indices + 3, 3,
+        )
+        starts = starts.reshape((len(starts), 1))
+        to_gather = np.array([corner_indices, prev_indices, next_indices])
+        to_gather = np.where(has_normal, to_gather, corner_indices)
+        corner_points = all_points[starts + to_gather]
+        light_source_point = self.light_source.points[0]
+
+        cache = self.shading_cache
+        if cache is not None and \
+                np.array_equal(cache[0], light_source_point) and \
+                np.array_equal(cache[1], has_normal) and \
+                np.array_equal(cache[2], corner_points):
+            factors = cache[3]
+        else:
+            factors = get_shading_factors(
+                corner_points[0],
+                get_unit_normals(
+                    corner_points[2] - corner_points[0],
+                    corner_points[1] - corner_points[0],
+                    has_normal,
+                ),
+                light_source_point,
+            )
+            self.shading_cache = (
+                np.array(light_source_point), has_normal,
+                corner_points, factors,
+            )
+        for index, mob_factors in zip(indices, factors):
+            self.mobject_to_shading_factors[mobjects[index]] = mob_factors
+
+    def get_projection_cache_key(self):
+        return (
+            self.get_rotation_matrix().tobytes(),
+            self.get_distance(),
+            self.get_frame_center().tobytes(),
+            self.exponential_projection,
+        )
 
     def get_phi(self):
         return self.phi_tracker.get_value()
@@ -169,7 +380,9 @@ class ThreeDCamera(Camera):
         distance = self.get_distance()
         rot_matrix = self.get_rotation_matrix()
 
-        points -= frame_center
+        # Not done in place, since points is often
+        # the points attribute of a mobject
+        points = points - frame_center
         points = np.dot(points, rot_matrix.T)
         zs = points[:, 2]
         zs[zs >= distance] = distance - 0.001
@@ -206,6 +419,9 @@ class ThreeDCamera(Camera):
             new_center = self.project_point(center)
             return points + (new_center - center)
         else:
+            projection = self.mobject_to_projected_points.get(mobject)
+            if projection is not None and projection[0] is points:
+                return projection[1]
             return self.project_points(points)
 
     def add_fixed_orientation_mobjects(
@@ -241,3 +457,32 @@ class ThreeDCamera(Camera):
         for mobject in self.extract_mobject_family_members(mobjects):
             if mobject in self.fixed_in_frame_mobjects:
                 self.fixed_in_frame_mobjects.remove(mobject)
+
+
+def get_unit_normals(vects1, vects2, has_normal=True):
+    """
+    Vectorized version of get_3d_vmob_unit_normal, given the vectors
+    from each corner to the points after and before it.  Where those
+    are parallel, or has_normal is False, the normal is UP.
+    """
+    normals = np.cross(vects1, vects2)
+    norms = np.sqrt((normals**2).sum(-1))
+    use_up = (norms == 0) | np.logical_not(has_normal)
+    norms[use_up] = 1
+    normals /= norms[..., np.newaxis]
+    normals[use_up] = UP
+    return normals
+
+
+def get_shading_factors(points, unit_normals, light_source):
+    """
+    What get_shaded_rgb would add to the color at each of points,
+    for the corresponding unit_normals.
+    """
+    to_sun = light_source - points
+    norms = np.sqrt((to_sun**2).sum(-1))
+    norms[norms == 0] = 1
+    to_sun /= norms[..., np.newaxis]
+    factors = 0.5 * (unit_normals * to_sun).sum(-1)**3
+    factors[factors < 0] *= 0.5
+    return factors
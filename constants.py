@@ -53,6 +53,17 @@ def get_configuration():
         parser.add_argument("-r", "--resolution")
         parser.add_argument("-c", "--color")
         parser.add_argument("-d", "--output_directory")
+        parser.add_argument("-j", "--rendering_processes")
+        parser.add_argument(
+            "--dry_run", action="store_true",
+            help="Run all animation logic, without drawing or writing anything, "
+                 "and report how long each animation took",
+        )
+        parser.add_argument(
+            "--adaptive_preview", nargs="?", const=1.0, type=float,
+            help="Adjust resolution and frame skipping so that rendering takes "
+                 "about this many times as long as the scene (default 1)",
+        )
         args = parser.parse_args()
         if args.output_name is not None:
             output_name_root, output_name_ext = os.path.splitext(
@@ -81,7 +92,9 @@ def get_configuration():
         "open_video_upon_completion": args.preview,
         "show_file_in_finder": args.show_file_in_finder,
         # By default, write to file
-        "write_to_movie": args.write_to_movie or not args.show_last_frame,
+        "write_to_movie": not args.dry_run and (
+            args.write_to_movie or not args.show_last_frame
+        ),
         "show_last_frame": args.show_last_frame,
         "save_pngs": args.save_pngs,
         # If -t is passed in (for transparent), this will be RGBA
@@ -94,6 +107,10 @@ def get_configuration():
         "output_dir": output_dir,
         "start_at_animation_number": args.start_at_animation_number,
         "end_at_animation_number": None,
+        "n_rendering_processes": int(args.rendering_processes or 1),
+        "dry_run": args.dry_run,
+        "adaptive_preview": args.adaptive_preview is not None,
+        "preview_time_budget": args.adaptive_preview or 1.0,
     }
 
     # Camera configuration
@@ -146,7 +163,7 @@ def get_configuration():
             config["start_at_animation_number"] = int(stan)
 
     config["skip_animations"] = any([
-        config["show_last_frame"] and not config["write_to_movie"],
+        config["show_last_frame"] and not config["write_to_movie"] and not args.dry_run,
         config["start_at_animation_number"],
     ])
     return config
@@ -165,6 +182,7 @@ def init_directories(config):
     global TEX_IMAGE_DIR
     global MOBJECT_DIR
     global IMAGE_MOBJECT_DIR
+    global BACKGROUND_DIR
     global LIB_DIR
     global TEX_TEXT_TO_REPLACE
     global TEMPLATE_TEX_FILE
@@ -197,10 +215,11 @@ def init_directories(config):
     # These two may be deprecated now.
     MOBJECT_DIR = os.path.join(FILE_DIR, "mobjects")
     IMAGE_MOBJECT_DIR = os.path.join(MOBJECT_DIR, "image")
+    BACKGROUND_DIR = os.path.join(FILE_DIR, "backgrounds")
 
     for folder in [FILE_DIR, RASTER_IMAGE_DIR, SVG_IMAGE_DIR, ANIMATIONS_DIR, TEX_DIR,
                    TEX_IMAGE_DIR, SAVE_DIR, MOBJECT_DIR, IMAGE_MOBJECT_DIR,
-                   STAGED_SCENES_DIR]:
+                   BACKGROUND_DIR, STAGED_SCENES_DIR]:
         if not os.path.exists(folder):
             os.makedirs(folder)
 
@@ -335,10 +354,11 @@ TEX_IMAGE_DIR = TEX_DIR  # TODO, What is this doing?
 # These two may be depricated now.
 MOBJECT_DIR = os.path.join(FILE_DIR, "mobjects")
 IMAGE_MOBJECT_DIR = os.path.join(MOBJECT_DIR, "image")
+BACKGROUND_DIR = os.path.join(FILE_DIR, "backgrounds")
 
 for folder in [FILE_DIR, RASTER_IMAGE_DIR, SVG_IMAGE_DIR, ANIMATIONS_DIR, TEX_DIR,
                TEX_IMAGE_DIR, MOBJECT_DIR, IMAGE_MOBJECT_DIR,
-               STAGED_SCENES_DIR]:
+               BACKGROUND_DIR, STAGED_SCENES_DIR]:
     if not os.path.exists(folder):
         os.makedirs(folder)
 
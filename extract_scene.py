@@ -23,9 +23,9 @@ def handle_scene(scene, **config):
         curr_stdout = sys.stdout
         sys.stdout = open(os.devnull, "w")
 
-    if config["show_last_frame"]:
+    if config["show_last_frame"] and not config["dry_run"]:
         scene.save_image(mode=config["saved_image_mode"])
-    open_file = any([
+    open_file = not config["dry_run"] and any([
         config["show_last_frame"],
         config["open_video_upon_completion"],
         config["show_file_in_finder"]
@@ -154,6 +154,10 @@ def main():
             "movie_file_extension",
             "start_at_animation_number",
             "end_at_animation_number",
+            "n_rendering_processes",
+            "dry_run",
+            "adaptive_preview",
+            "preview_time_budget",
         ]
     ])
 
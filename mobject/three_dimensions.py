@@ -2,10 +2,13 @@
 
 from constants import *
 
+from mobject.mobject import Mobject
 from mobject.types.vectorized_mobject import VMobject
 from mobject.types.vectorized_mobject import VGroup
 from mobject.geometry import Square
 
+from utils.bezier import interpolate
+from utils.color import color_to_rgba
 from utils.iterables import tuplify
 from utils.space_ops import z_to_vector
 
@@ -145,6 +148,234 @@ class ParametricSurface(VGroup):
             face.set_fill(colors[c_index], opacity=opacity)
 
 
+class SurfaceMesh(Mobject):
+    """
+    Like ParametricSurface, but rather than one ThreeDVMobject per
+    face, all vertices are held in one array, and face colors in
+    another, which makes high resolutions practical.  points holds the
+    (u_res + 1) x (v_res + 1) grid of vertices, row by row, and faces
+    are drawn by the camera all at once.
+    """
+    CONFIG = {
+        "u_min": 0,
+        "u_max": 1,
+        "v_min": 0,
+        "v_max": 1,
+        "resolution": 32,
+        "fill_color": BLUE_D,
+        "fill_opacity": 1.0,
+        "checkerboard_colors": [BLUE_D, BLUE_E],
+        "stroke_color": LIGHT_GREY,
+        "stroke_width": 0.5,
+        "stroke_opacity": 1.0,
+    }
+
+    def __init__(self, func=None, **kwargs):
+        Mobject.__init__(self, **kwargs)
+        if func is not None:
+            self.apply_uv_function(func)
+
+    def generate_points(self):
+        res = tuplify(self.resolution)
+        if len(res) == 1:
+            self.u_res = self.v_res = res[0]
+        else:
+            self.u_res, self.v_res = res
+        u_values, v_values = self.get_uv_grid()
+        self.points = np.array([
+            u_values, v_values, np.zeros(u_values.shape)
+        ]).reshape((3, -1)).T
+
+    def init_colors(self):
+        n_faces = self.get_num_faces()
+        self.fill_rgbas = np.repeat(
+            [color_to_rgba(self.fill_color, self.fill_opacity)],
+            n_faces, axis=0,
+        )
+        self.stroke_rgbas = np.repeat(
+            [color_to_rgba(self.stroke_color, self.stroke_opacity)],
+            n_faces, axis=0,
+        )
+        if self.checkerboard_colors:
+            self.set_fill_by_checkerboard(*self.checkerboard_colors)
+
+    def get_uv_grid(self):
+        """
+        Returns two (u_res + 1) x (v_res + 1) arrays, of the u and v
+        values each vertex started out at.
+        """
+        return np.meshgrid(
+            np.linspace(self.u_min, self.u_max, self.u_res + 1),
+            np.linspace(self.v_min, self.v_max, self.v_res + 1),
+            indexing="ij",
+        )
+
+    def apply_uv_function(self, func):
+        """
+        Moves each vertex to func(u, v).  func is first tried on
+        whole arrays of u and v values at once, and only if that
+        doesn't give back an array of points is it called vertex
+        by vertex.
+        """
+        u_values, v_values = self.get_uv_grid()
+        grid_shape = u_values.shape
+        try:
+            result = np.array(func(u_values, v_values), dtype='float')
+        except Exception:
+            result = None
+        if result is not None and result.shape == (3,) + grid_shape:
+            result = np.moveaxis(result, 0, -1)
+        if result is None or result.shape != grid_shape + (3,):
+            result = np.array([
+                func(u, v)
+                for u, v in zip(u_values.flatten(), v_values.flatten())
+            ], dtype='float')
+        self.points = result.reshape((-1, 3))
+        return self
+
+    # Faces
+
+    def get_resolution(self):
+        return (self.u_res, self.v_res)
+
+    def get_num_faces(self):
+        return self.u_res * self.v_res
+
+    def get_vertex_grid(self):
+        return self.points.reshape((self.u_res + 1, self.v_res + 1, 3))
+
+    def get_face_vertex_indices(self):
+        """
+        Returns an (n_faces, 4) array of the indices into points of each
+        face's corners, in the same order as the corners of the faces
+        of a ParametricSurface.  Faces are ordered by u index, then by
+        v index.
+        """
+        u_indices, v_indices = np.meshgrid(
+            np.arange(self.u_res), np.arange(self.v_res),
+            indexing="ij",
+        )
+        row_length = self.v_res + 1
+        starts = (u_indices * row_length + v_indices).flatten()
+        return np.array([
+            starts,
+            starts + row_length,
+            starts + row_length + 1,
+            starts + 1,
+        ]).T
+
+    def get_face_corners(self):
+        return self.points[self.get_face_vertex_indices()]
+
+    # Colors
+
+    def set_fill(self, color=None, opacity=None, family=True):
+        if color is not None:
+            self.fill_rgbas[:, :3] = color_to_rgba(color)[:3]
+        if opacity is not None:
+            self.fill_rgbas[:, 3] = opacity
+        return self
+
+    def set_stroke(self, color=None, width=None, opacity=None, family=True):
+        if color is not None:
+            self.stroke_rgbas[:, :3] = color_to_rgba(color)[:3]
+        if opacity is not None:
+            self.stroke_rgbas[:, 3] = opacity
+        if width is not None:
+            self.stroke_width = width
+        return self
+
+    def set_color(self, color, family=True):
+        self.set_fill(color)
+        self.set_stroke(color)
+        self.color = color
+        return self
+
+    def set_fill_by_checkerboard(self, *colors, opacity=None):
+        u_indices, v_indices = np.meshgrid(
+            np.arange(self.u_res), np.arange(self.v_res),
+            indexing="ij",
+        )
+        c_indices = ((u_indices + v_indices) % len(colors)).flatten()
+        rgbs = np.array([color_to_rgba(color)[:3] for color in colors])
+        self.fill_rgbas[:, :3] = rgbs[c_indices]
+        if opacity is not None:
+            self.fill_rgbas[:, 3] = opacity
+        return self
+
+    def fade_no_recurse(self, darkness):
+        # Fades by opacity, as with VMobject, rather than toward black
+        for rgbas in self.fill_rgbas, self.stroke_rgbas:
+            rgbas[:, 3] *= 1.0 - darkness
+        return self
+
+    def fade_to_no_recurse(self, color, alpha):
+        rgb = color_to_rgba(color)[:3]
+        for rgbas in self.fill_rgbas, self.stroke_rgbas:
+            rgbas[:, :3] = interpolate(rgbas[:, :3], rgb, alpha)
+        return self
+
+    def get_fill_rgbas(self):
+        return self.fill_rgbas
+
+    def get_stroke_rgbas(self):
+        return self.stroke_rgbas
+
+    def get_stroke_width(self):
+        return self.stroke_width
+
+    # Alignment
+
+    def align_points(self, mobject):
+        if not isinstance(mobject, SurfaceMesh):
+            raise Exception(
+                "A SurfaceMesh can only be aligned with another SurfaceMesh"
+            )
+        u_res = max(self.u_res, mobject.u_res)
+        v_res = max(self.v_res, mobject.v_res)
+        for mesh in self, mobject:
+            mesh.resample(u_res, v_res)
+        return self
+
+    def resample(self, u_res, v_res):
+        """
+        Changes the resolution to u_res x v_res, interpolating
+        the current vertices, with each new face taking the colors
+        of the old face it lies within.
+        """
+        if (u_res, v_res) == self.get_resolution():
+            return self
+        grid = self.get_vertex_grid()
+        u_index_floats = np.linspace(0, self.u_res, u_res + 1)
+        v_index_floats = np.linspace(0, self.v_res, v_res + 1)
+        u0 = np.minimum(u_index_floats.astype(int), self.u_res - 1)
+        v0 = np.minimum(v_index_floats.astype(int), self.v_res - 1)
+        u_alphas = (u_index_floats - u0).reshape((-1, 1, 1))
+        v_alphas = (v_index_floats - v0).reshape((1, -1, 1))
+        # Bilinear interpolation within the old faces
+        lower = interpolate(grid[u0][:, v0], grid[u0 + 1][:, v0], u_alphas)
+        upper = interpolate(
+            grid[u0][:, v0 + 1], grid[u0 + 1][:, v0 + 1], u_alphas
+        )
+        self.points = interpolate(lower, upper, v_alphas).reshape((-1, 3))
+
+        u_faces = (np.arange(u_res) * self.u_res) // u_res
+        v_faces = (np.arange(v_res) * self.v_res) // v_res
+        face_indices = (
+            u_faces.reshape((-1, 1)) * self.v_res + v_faces
+        ).flatten()
+        self.fill_rgbas = self.fill_rgbas[face_indices]
+        self.stroke_rgbas = self.stroke_rgbas[face_indices]
+        self.u_res, self.v_res = u_res, v_res
+        return self
+
+    def interpolate_color(self, mobject1, mobject2, alpha):
+        for attr in ["fill_rgbas", "stroke_rgbas", "stroke_width"]:
+            setattr(self, attr, interpolate(
+                getattr(mobject1, attr), getattr(mobject2, attr), alpha
+            ))
+
+
 # Specific shapes
 
 
@@ -1,5 +1,6 @@
 
 
+import itertools as it
 import numpy as np
 
 from PIL import Image
@@ -13,6 +14,9 @@ from utils.color import color_to_int_rgb
 from utils.config_ops import digest_config
 from utils.images import get_full_raster_image_path
 
+# Source of the keys returned by ImageMobject.get_mipmap_key
+mipmap_keys = it.count()
+
 
 class AbstractImageMobject(Mobject):
     """
@@ -26,6 +30,31 @@ class AbstractImageMobject(Mobject):
     def get_pixel_array(self):
         raise Exception("Not implemented")
 
+    def get_pixel_array_version(self):
+        """
+        Returns a value which changes whenever the contents of the pixel
+        array change in place, so that things computed from it can be
+        cached, or None if there's no such guarantee.
+        """
+        return None
+
+    def get_mipmap_levels(self):
+        """
+        Returns the pixel array, followed by successively halved
+        versions of it, so that images shown much smaller than their
+        native size can be resampled from a nearby level.
+        """
+        return [self.get_pixel_array()]
+
+    def get_mipmap_key(self):
+        """
+        Returns an int which is the same for two calls only if
+        get_mipmap_levels returned the same thing for both, so that
+        levels can be shared, rather than copied, between them.  None
+        if there's no such guarantee.
+        """
+        return None
+
     def set_color(self):
         # Likely to be implemented in subclasses, but no obgligation
         pass
@@ -50,6 +79,9 @@ class ImageMobject(AbstractImageMobject):
     CONFIG = {
         "invert": False,
         "image_mode": "RGBA",
+        # Levels of the mipmap pyramid stop being
+        # halved once they're this small
+        "min_mipmap_size": 16,
     }
 
     def __init__(self, filename_or_array, **kwargs):
@@ -63,6 +95,8 @@ class ImageMobject(AbstractImageMobject):
         self.change_to_rgba_array()
         if self.invert:
             self.pixel_array[:, :, :3] = 255 - self.pixel_array[:, :, :3]
+        self.pixel_array_version = 0
+        self.mipmap_cache = None
         AbstractImageMobject.__init__(self, **kwargs)
 
     def change_to_rgba_array(self):
@@ -82,11 +116,46 @@ class ImageMobject(AbstractImageMobject):
     def get_pixel_array(self):
         return self.pixel_array
 
+    def get_pixel_array_version(self):
+        return self.pixel_array_version
+
+    def get_mipmap_levels(self):
+        pa = self.pixel_array
+        cache = self.mipmap_cache
+        if cache is not None:
+            source, version, levels, key = cache
+            if source is pa and version == self.pixel_array_version:
+                return levels
+        levels = [pa]
+        height, width = pa.shape[:2]
+        while min(height, width) >= 2 * self.min_mipmap_size:
+            height //= 2
+            width //= 2
+            image = Image.fromarray(levels[-1], mode="RGBA")
+            levels.append(np.array(image.resize((width, height), Image.BOX)))
+        self.mipmap_cache = (
+            pa, self.pixel_array_version, levels, next(mipmap_keys)
+        )
+        return levels
+
+    def get_mipmap_key(self):
+        # Makes sure the cache is up to date
+        self.get_mipmap_levels()
+        return self.mipmap_cache[3]
+
+    def note_pixel_array_change(self):
+        """
+        Should be called after modifying the pixel array in place
+        """
+        self.pixel_array_version += 1
+        return self
+
     def set_color(self, color, alpha=None, family=True):
         rgb = color_to_int_rgb(color)
         self.pixel_array[:, :, :3] = rgb
         if alpha is not None:
             self.pixel_array[:, :, 3] = int(255 * alpha)
+        self.note_pixel_array_change()
         for submob in self.submobjects:
             submob.set_color(color, alpha, family)
         self.color = color
@@ -94,6 +163,7 @@ class ImageMobject(AbstractImageMobject):
 
     def set_opacity(self, alpha):
         self.pixel_array[:, :, 3] = int(255 * alpha)
+        self.note_pixel_array_change()
         return self
 
     def fade_no_recurse(self, darkness=0.5):
@@ -105,6 +175,7 @@ class ImageMobject(AbstractImageMobject):
         self.pixel_array = interpolate(
             mobject1.pixel_array, mobject2.pixel_array, alpha
         ).astype(self.pixel_array_dtype)
+        self.note_pixel_array_change()
 
 # TODO, add the ability to have the dimensions/orientation of this
 # mobject more strongly tied to the frame of the camera it contains,
@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import queue
+import threading
+
+from utils.images import rgba_to_yuv420p
+
+
+class FrameWriter(object):
+    """
+    Writes frames to a stream, typically the stdin of an ffmpeg
+    process, on a background thread, so that new frames are drawn
+    while earlier ones are still being encoded.  At most
+    max_queued_frames frames wait to be written; past that,
+    write_frame blocks until the stream catches up.
+
+    Frames are given as rgba arrays.  With a pixel_format of
+    "yuv420p", they're converted before being written, which takes
+    1.5 bytes per pixel rather than 4.  The writer thread splits that
+    conversion into bands of rows among n_conversion_threads threads.
+
+    If given, release_frame is called with each frame once it has
+    been written, or dropped after an error.
+    """
+
+    def __init__(self, stream, max_queued_frames=2, release_frame=None,
+                 pixel_format="rgba", n_conversion_threads=1):
+        if pixel_format not in ["rgba", "yuv420p"]:
+            raise Exception("Unsupported pixel format %s" % pixel_format)
+        self.stream = stream
+        self.release_frame = release_frame
+        self.pixel_format = pixel_format
+        # Reused for every converted frame
+        self.converted_frame = None
+        self.n_conversion_threads = n_conversion_threads
+        self.conversion_thread_pool = None
+        if pixel_format != "rgba" and n_conversion_threads > 1:
+            self.conversion_thread_pool = ThreadPoolExecutor(
+                max_workers=n_conversion_threads
+            )
+        self.queue = queue.Queue(max_queued_frames)
+        self.error = None
+        self.thread = threading.Thread(target=self.write_queued_frames)
+        # So an exception in construct doesn't leave the process hanging
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write_frame(self, frame):
+        """
+        frame must not be modified until it has been written
+        """
+        self.raise_error_if_any()
+        self.queue.put(frame)
+
+    def write_queued_frames(self):
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                return
+            # After an error, the queue is still drained,
+            # so that write_frame never blocks
+            if self.error is None:
+                try:
+                    # Written straight from the array's buffer, with no copy
+                    self.stream.write(memoryview(self.convert_frame(frame)))
+                except Exception as error:
+                    self.error = error
+            if self.release_frame is not None:
+                self.release_frame(frame)
+
+    def convert_frame(self, frame):
+        if self.pixel_format == "yuv420p":
+            self.converted_frame = rgba_to_yuv420p(
+                frame, self.converted_frame,
+                self.conversion_thread_pool, self.n_conversion_threads,
+            )
+            return self.converted_frame
+        return np.ascontiguousarray(frame)
+
+    def raise_error_if_any(self):
+        if self.error is not None:
+            raise Exception(
+                "Failed to write frame: %s" % str(self.error)
+            )
+
+    def close(self):
+        """
+        Blocks until all queued frames are written
+        """
+        self.queue.put(None)
+        self.thread.join()
+        if self.conversion_thread_pool is not None:
+            self.conversion_thread_pool.shutdown()
+        self.raise_error_if_any()
+
+
+class FrameBufferPool(object):
+    """
+    A ring of preallocated frame buffers, for the camera to draw into
+    and a FrameWriter to write from, so that no frame is allocated or
+    copied on its way to the movie pipe.
+
+    A buffer is handed out by acquire with one use, and given back
+    once each of its uses is released.  Each time it's passed to the
+    writer counts as another use, as in a wait, where one buffer is
+    written many times over.
+    """
+
+    def __init__(self, shape, dtype, n_buffers):
+        self.buffers = [np.zeros(shape, dtype=dtype) for x in range(n_buffers)]
+        self.free_buffers = queue.Queue()
+        for buffer in self.buffers:
+            self.free_buffers.put(buffer)
+        self.use_counts = dict([(id(buffer), 0) for buffer in self.buffers])
+        self.lock = threading.Lock()
+
+    def owns(self, array):
+        return any([array is buffer for buffer in self.buffers])
+
+    def acquire(self):
+        """
+        Blocks until a buffer is free
+        """
+        buffer = self.free_buffers.get()
+        self.use_counts[id(buffer)] = 1
+        return buffer
+
+    def add_use(self, buffer):
+        if not self.owns(buffer):
+            return
+        with self.lock:
+            self.use_counts[id(buffer)] += 1
+
+    def release(self, buffer):
+        if not self.owns(buffer):
+            return
+        with self.lock:
+            self.use_counts[id(buffer)] -= 1
+            is_free = self.use_counts[id(buffer)] == 0
+        if is_free:
+            self.free_buffers.put(buffer)
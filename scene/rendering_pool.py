@@ -0,0 +1,200 @@
+from collections import deque
+import multiprocessing as mp
+import numpy as np
+import os
+import tempfile
+
+from camera.camera import Camera
+from camera.display_list import ImageDisplayItem
+from camera.display_list import display_list_from_bytes
+from camera.display_list import display_list_to_bytes
+
+# Per process state of the rendering pool's workers
+worker_state = {}
+
+
+def init_rendering_worker(camera_config):
+    worker_state["camera"] = Camera(**camera_config)
+    worker_state["background_file"] = None
+    worker_state["mipmap_key_to_levels"] = {}
+
+
+def render_display_list(display_list_bytes, background_file, mipmap_key_to_files):
+    camera = worker_state["camera"]
+    # Memory mapped, like the background, and only kept
+    # for as long as they're still being drawn
+    loaded = worker_state["mipmap_key_to_levels"]
+    mipmap_key_to_levels = dict([
+        (key, loaded.get(key) or [
+            np.load(file_name, mmap_mode="r") for file_name in file_names
+        ])
+        for key, file_names in mipmap_key_to_files.items()
+    ])
+    worker_state["mipmap_key_to_levels"] = mipmap_key_to_levels
+    display_list = display_list_from_bytes(
+        display_list_bytes, mipmap_key_to_levels
+    )
+    if worker_state["background_file"] != background_file:
+        # Memory mapped, so all workers share one copy
+        worker_state["background"] = np.load(background_file, mmap_mode="r")
+        worker_state["background_file"] = background_file
+    background = worker_state["background"]
+    ph, pw = background.shape[:2]
+    if (camera.get_pixel_height(), camera.get_pixel_width()) != (ph, pw):
+        camera.reset_pixel_shape(ph, pw)
+    camera.set_frame_from_display_list(display_list)
+    camera.set_pixel_array(background)
+    camera.capture_display_list(display_list)
+    return camera.get_pixel_array()
+
+
+class RenderingPool(object):
+    """
+    Rasterizes display lists, as recorded by Camera.get_display_list,
+    on a pool of worker processes.  Frames are handed back in the order
+    their display lists were submitted, however out of order they
+    finish.
+
+    The pixels of images with a mipmap key (see
+    AbstractImageMobject.get_mipmap_key) are only written out once
+    per key, to memory mapped files, rather than with every frame.
+    """
+    CONFIG_KEYS_FROM_CAMERA = [
+        "pixel_height",
+        "pixel_width",
+        "pixel_array_dtype",
+        "n_channels",
+        "image_mode",
+        "cairo_line_width_multiple",
+        "cairo_miter_limit",
+        "max_allowable_norm",
+    ]
+
+    def __init__(self, camera, n_processes, max_pending_frames=None):
+        camera_config = dict([
+            (key, getattr(camera, key))
+            for key in self.CONFIG_KEYS_FROM_CAMERA
+        ])
+        # Each worker keeps drawing over the same background,
+        # so only the parts drawn over last frame need resetting
+        camera_config["use_dirty_tiles"] = True
+        # Display lists come already culled by the camera recording them
+        camera_config["cull_offscreen_mobjects"] = False
+        self.pool = mp.Pool(
+            n_processes,
+            initializer=init_rendering_worker,
+            initargs=(camera_config,),
+        )
+        self.max_pending_frames = max_pending_frames or 2 * n_processes
+        self.pending_frames = deque()
+        self.background = None
+        self.background_file = None
+        self.mipmap_key_to_files = {}
+        # Number of the last frame drawing each image
+        self.mipmap_key_to_last_frame = {}
+        self.n_submitted_frames = 0
+        self.n_finished_frames = 0
+
+    def submit(self, display_list, background, n_frames=1):
+        """
+        Queues up display_list to be drawn over background, standing
+        in for n_frames frames, and returns the list of frames which
+        are done, in order.
+        """
+        frames = []
+        if background is not self.background:
+            # Workers may still be reading the old background's file
+            frames += self.flush()
+            self.set_background(background)
+        mipmap_key_to_files = self.get_mipmap_key_to_files(display_list)
+        # Sent in its serialized form, which is much quicker
+        # to pickle than its many small arrays
+        self.pending_frames.append((
+            self.pool.apply_async(render_display_list, (
+                display_list_to_bytes(display_list, mipmap_key_to_files),
+                self.background_file,
+                mipmap_key_to_files,
+            )),
+            n_frames
+        ))
+        self.n_submitted_frames += 1
+        while len(self.pending_frames) > self.max_pending_frames or \
+                (self.pending_frames and self.pending_frames[0][0].ready()):
+            frames += self.get_next_frames()
+        return frames
+
+    def get_next_frames(self):
+        result, n_frames = self.pending_frames.popleft()
+        frame = result.get()
+        self.n_finished_frames += 1
+        self.remove_unused_mipmap_files()
+        return [frame] * n_frames
+
+    def flush(self):
+        frames = []
+        while self.pending_frames:
+            frames += self.get_next_frames()
+        return frames
+
+    def get_mipmap_key_to_files(self, display_list):
+        """
+        Writes out the mipmap levels of any images in display_list
+        which haven't been already, and returns a dict mapping the
+        mipmap keys of its images to the files holding their levels
+        """
+        result = {}
+        for item in display_list.get_items():
+            if not isinstance(item, ImageDisplayItem):
+                continue
+            key = item.mipmap_key
+            if key is None:
+                continue
+            if key not in self.mipmap_key_to_files:
+                self.mipmap_key_to_files[key] = list(map(
+                    self.save_array_to_temp_file, item.mipmap_levels
+                ))
+            result[key] = self.mipmap_key_to_files[key]
+            self.mipmap_key_to_last_frame[key] = self.n_submitted_frames
+        return result
+
+    def remove_unused_mipmap_files(self):
+        """
+        Removes the files of images which every frame drawing them
+        is done with, unless the last frame submitted draws them,
+        in which case the next one likely will too.  Should an image
+        come back, its files are just written again.
+        """
+        for key, last_frame in list(self.mipmap_key_to_last_frame.items()):
+            if last_frame < self.n_finished_frames and \
+                    last_frame < self.n_submitted_frames - 1:
+                self.remove_mipmap_files(key)
+
+    def save_array_to_temp_file(self, array):
+        handle, file_name = tempfile.mkstemp(suffix=".npy")
+        with os.fdopen(handle, "wb") as outfile:
+            np.save(outfile, array)
+        return file_name
+
+    def remove_mipmap_files(self, key):
+        for file_name in self.mipmap_key_to_files.pop(key):
+            os.remove(file_name)
+        self.mipmap_key_to_last_frame.pop(key)
+
+    def set_background(self, background):
+        self.remove_background_file()
+        self.background_file = self.save_array_to_temp_file(background)
+        self.background = background
+
+    def remove_background_file(self):
+        if self.background_file is not None:
+            os.remove(self.background_file)
+            self.background_file = None
+
+    def close(self):
+        frames = self.flush()
+        self.pool.close()
+        self.pool.join()
+        self.remove_background_file()
+        for key in list(self.mipmap_key_to_files.keys()):
+            self.remove_mipmap_files(key)
+        return frames
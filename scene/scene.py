@@ -6,8 +6,10 @@ import os
 import random
 import shutil
 import subprocess as sp
+import time
 import warnings
 
+from PIL import Image
 from tqdm import tqdm as ProgressDisplay
 
 from constants import *
@@ -15,8 +17,14 @@ from constants import *
 from animation.animation import Animation
 from animation.transform import MoveToTarget
 from camera.camera import Camera
+from camera.null_camera import NullCamera
+from camera.null_camera import get_null_camera_class
 from continual_animation.continual_animation import ContinualAnimation
 from mobject.mobject import Mobject
+from scene.frame_writer import FrameBufferPool
+from scene.frame_writer import FrameWriter
+from scene.rendering_pool import RenderingPool
+from utils.images import rgba_to_yuv420p
 from utils.iterables import list_update
 from utils.output_directory_getters import add_extension_if_not_present
 from utils.output_directory_getters import get_movie_output_directory
@@ -43,11 +51,54 @@ class Scene(Container):
         "random_seed": 0,
         "start_at_animation_number": None,
         "end_at_animation_number": None,
+        # If greater than 1, frames of animations are only recorded
+        # as display lists here, and rasterized by this many worker
+        # processes.  Not used when saving pngs.
+        "n_rendering_processes": 1,
+        # Runs all animation and updater logic for every frame, as
+        # usual, but with a NullCamera, so nothing is drawn or written
+        "dry_run": False,
+        # In adaptive preview mode, the camera's resolution (between
+        # plays) and the number of frames skipped (during them) are
+        # adjusted so that rendering takes about preview_time_budget
+        # times as long as the scene itself.  Frames are upscaled to
+        # preview_pixel_shape, given as (height, width), for output.
+        "adaptive_preview": False,
+        "preview_time_budget": 1.0,
+        "preview_pixel_shape": (360, 640),
+        "min_preview_pixel_height": 90,
+        "max_preview_frame_skip": 8,
+        # Frames are piped to ffmpeg on a separate thread, with up
+        # to this many waiting while ffmpeg encodes earlier ones
+        "max_queued_movie_frames": 2,
+        # If True, and the movie isn't transparent, frames are converted
+        # to yuv420p before being piped to ffmpeg, which takes well under
+        # half the bandwidth of rgba, but leaves less time for drawing.
+        # Otherwise ffmpeg, which converts much faster per thread,
+        # does it.  The conversion is split among this many threads.
+        "pipe_yuv_to_movie": False,
+        "n_yuv_conversion_threads": 4,
+        # Runs of repeated frames lasting at least this many seconds, as
+        # in a wait with nothing updating, are encoded as separate movie
+        # segments from a single still, rather than piped frame by frame.
+        # Segments are joined, without reencoding, once the scene ends.
+        # Set to None to pipe every frame.
+        "min_still_movie_duration": 1.0,
+        # Frames repeated by reference are always found.  This also
+        # compares the contents of each new frame with the last.
+        "compare_movie_frame_contents": False,
+        # Still segments are encoded alongside the rest of the scene,
+        # by at most this many ffmpeg processes at once
+        "max_still_segment_processes": 2,
     }
 
     def __init__(self, **kwargs):
         # Perhaps allow passing in a non-empty *mobjects parameter?
         Container.__init__(self, **kwargs)
+        if self.dry_run:
+            self.camera_class = get_null_camera_class(self.camera_class)
+            self.write_to_movie = False
+            self.save_pngs = False
         self.camera = self.camera_class(**self.camera_config)
         self.mobjects = []
         self.continual_animations = []
@@ -58,6 +109,13 @@ class Scene(Container):
         self.frame_num = 0
         self.current_scene_time = 0
         self.original_skipping_status = self.skip_animations
+        self.rendering_pool = None
+        self.frame_buffer_pool = None
+        self.animation_timings = []
+        self.preview_frame_skip = 1
+        self.preview_render_time = None
+        self.original_background = None
+        self.resized_background = None
         if self.name is None:
             self.name = self.__class__.__name__
         if self.random_seed is not None:
@@ -65,6 +123,15 @@ class Scene(Container):
             np.random.seed(self.random_seed)
 
         self.setup()
+        if self.adaptive_preview:
+            self.set_camera_pixel_shape(*self.preview_pixel_shape)
+        parallel_rendering_allowed = not any([
+            self.save_pngs, self.dry_run, self.adaptive_preview,
+        ])
+        if self.n_rendering_processes > 1 and parallel_rendering_allowed:
+            self.rendering_pool = RenderingPool(
+                self.camera, self.n_rendering_processes
+            )
         if self.write_to_movie:
             self.open_movie_pipe()
         try:
@@ -77,14 +144,27 @@ class Scene(Container):
         self.skip_animations = False
         self.wait(self.frame_duration)
 
+        if self.rendering_pool is not None:
+            self.add_frames(*self.rendering_pool.close())
+            self.rendering_pool = None
         if self.write_to_movie:
             self.close_movie_pipe()
+        if self.dry_run:
+            self.print_animation_timings()
         print("Played a total of %d animations" % self.num_plays)
 
     def __getstate__(self):
         state = self.__dict__.copy()
         if "writing_process" in state:
             del state["writing_process"]
+        if "frame_writer" in state:
+            del state["frame_writer"]
+        if "rendering_pool" in state:
+            del state["rendering_pool"]
+        if "frame_buffer_pool" in state:
+            del state["frame_buffer_pool"]
+        if "still_segment_processes" in state:
+            del state["still_segment_processes"]
         if "args_to_rename_file" in state:
             del state["args_to_rename_file"]
         if "name" in state:
@@ -137,6 +217,10 @@ class Scene(Container):
         self.camera = camera
 
     def get_frame(self):
+        if self.dry_run:
+            # Nothing's drawn, so rather than copying the camera's
+            # stand-in pixel array, it's passed on as is
+            return self.camera.get_pixel_array()
         return np.array(self.camera.get_pixel_array())
 
     def get_image(self):
@@ -163,6 +247,7 @@ class Scene(Container):
             **kwargs):
         if self.skip_animations and dont_update_when_skipping:
             return
+        self.use_next_frame_buffer()
         if mobjects is None:
             mobjects = list_update(
                 self.mobjects,
@@ -176,6 +261,133 @@ class Scene(Container):
         kwargs["include_submobjects"] = include_submobjects
         self.capture_mobjects_in_camera(mobjects, **kwargs)
 
+    def render_frame(self, mobjects=None, background=None, n_frames=1):
+        """
+        Updates the frame, and passes it on to add_frames, n_frames
+        times over.  With a rendering pool, this only records a display
+        list, and the frame, along with any others which have finished,
+        is added once a worker has drawn it.  See flush_rendering_pool.
+        """
+        if self.rendering_pool is None or self.skip_animations:
+            self.update_frame(mobjects, background)
+            self.add_frames(*[self.get_output_frame()] * n_frames)
+            return
+        if mobjects is None:
+            mobjects = list_update(
+                self.mobjects,
+                self.foreground_mobjects,
+            )
+        if background is None:
+            background = self.camera.background
+        display_list = self.camera.get_display_list(mobjects)
+        self.add_frames(*self.rendering_pool.submit(
+            display_list, background, n_frames
+        ))
+
+    def use_next_frame_buffer(self):
+        """
+        With a frame buffer pool, each frame is drawn into a fresh
+        buffer, while the last is still free to be written out
+        """
+        pool = self.frame_buffer_pool
+        if pool is None:
+            return
+        pool.release(self.camera.pixel_array)
+        self.camera.set_pixel_array_buffer(pool.acquire())
+
+    def get_output_frame(self):
+        if self.dry_run:
+            return self.get_frame()
+        if self.frame_buffer_pool is not None:
+            # Not copied, since the next frame is
+            # drawn into another buffer
+            frame = self.camera.get_pixel_array()
+        else:
+            frame = self.get_frame()
+        if not self.adaptive_preview:
+            return frame
+        height, width = self.preview_pixel_shape
+        if frame.shape[:2] == (height, width):
+            return frame
+        image = Image.fromarray(frame).resize((width, height), Image.BILINEAR)
+        return np.array(image)
+
+    def set_camera_pixel_shape(self, pixel_height, pixel_width):
+        # Resizing the background, rather than recreating it,
+        # keeps any set with set_background.  It's always resized
+        # from the one originally set, so it doesn't get blurrier
+        # with each resize.
+        if self.camera.background is not self.resized_background:
+            # Set since the last resize
+            self.original_background = self.camera.background
+        background = Image.fromarray(self.original_background)
+        self.camera.reset_pixel_shape(pixel_height, pixel_width)
+        self.camera.set_background(np.array(background.resize(
+            (pixel_width, pixel_height), Image.BILINEAR
+        )))
+        self.resized_background = self.camera.background
+        self.camera.reset()
+
+    def get_frame_groups(self, time_progression):
+        """
+        Yields (t, n_frames) pairs, where the frame at time t should
+        stand in for n_frames frames, itself and those just before it.
+        That's always 1, except in adaptive preview mode.
+        """
+        n_frames = 0
+        last_index = len(time_progression) - 1
+        for index, t in enumerate(time_progression):
+            n_frames += 1
+            if n_frames >= self.preview_frame_skip or index == last_index:
+                yield t, n_frames
+                n_frames = 0
+
+    def update_preview_frame_skip(self, render_time):
+        """
+        render_time is how long one frame group took,
+        both running its logic and drawing it
+        """
+        if not self.adaptive_preview:
+            return
+        if self.preview_render_time is None:
+            self.preview_render_time = render_time
+        else:
+            # Smoothed, so one slow frame doesn't cause a jump
+            self.preview_render_time = 0.8 * self.preview_render_time + 0.2 * render_time
+        budget = self.frame_duration * self.preview_time_budget
+        self.preview_frame_skip = int(np.clip(
+            np.ceil(self.preview_render_time / budget),
+            1, self.max_preview_frame_skip,
+        ))
+
+    def update_preview_resolution(self):
+        """
+        Called before each play or wait, since the static
+        background of a play is drawn at a fixed resolution
+        """
+        if not self.adaptive_preview or self.preview_render_time is None:
+            return
+        budget = self.frame_duration * self.preview_time_budget
+        # Time spent drawing goes roughly as the number of pixels
+        scale_factor = np.sqrt(budget / self.preview_render_time)
+        if 0.8 < scale_factor < 1.25:
+            return
+        max_height, max_width = self.preview_pixel_shape
+        height = int(np.clip(
+            self.camera.get_pixel_height() * scale_factor,
+            self.min_preview_pixel_height, max_height,
+        ))
+        if height == self.camera.get_pixel_height():
+            return
+        width = int(round(height * max_width / max_height))
+        self.set_camera_pixel_shape(height, width)
+        # Timings at the old resolution no longer apply
+        self.preview_render_time = None
+
+    def flush_rendering_pool(self):
+        if self.rendering_pool is not None:
+            self.add_frames(*self.rendering_pool.flush())
+
     def freeze_background(self):
         self.update_frame()
         self.set_camera(Camera(self.get_frame()))
@@ -475,6 +687,7 @@ class Scene(Container):
             warnings.warn("Called Scene.play with no animations")
             return
         self.handle_animation_skipping()
+        self.start_animation_timing()
         animations = self.compile_play_args_to_animation_list(*args)
         for animation in animations:
             # This is where kwargs to play like run_time and rate_func
@@ -489,16 +702,22 @@ class Scene(Container):
 
         # Paint all non-moving objects onto the screen, so they don't
         # have to be rendered every frame
+        self.update_preview_resolution()
         self.update_frame(excluded_mobjects=moving_mobjects)
         static_image = self.get_frame()
         total_run_time = 0
-        for t in self.get_animation_time_progression(animations):
+        time_progression = self.get_animation_time_progression(animations)
+        for t, n_frames in self.get_frame_groups(time_progression):
+            frame_start_time = time.time()
             for animation in animations:
                 animation.update(t / animation.run_time)
-            self.continual_update(self.frame_duration, animations=animations)
-            self.update_frame(moving_mobjects, static_image)
-            self.add_frames(self.get_frame())
+            self.continual_update(
+                n_frames * self.frame_duration, animations=animations
+            )
+            self.render_frame(moving_mobjects, static_image, n_frames)
+            self.update_preview_frame_skip(time.time() - frame_start_time)
             total_run_time = t
+        self.flush_rendering_pool()
         self.mobjects_from_last_animation = [
             anim.mobject for anim in animations
         ]
@@ -507,9 +726,67 @@ class Scene(Container):
             self.continual_update(0)
         else:
             self.continual_update(self.frame_duration)
+        self.end_animation_timing("Animation %d: %s%s" % (
+            self.num_plays,
+            str(animations[0]),
+            (", etc." if len(animations) > 1 else ""),
+        ))
         self.num_plays += 1
         return self
 
+    def start_animation_timing(self):
+        self.animation_timing_start = (
+            time.time(),
+            self.current_scene_time,
+            self.get_camera_capture_counts(),
+        )
+
+    def end_animation_timing(self, description):
+        start_time, start_scene_time, start_counts = self.animation_timing_start
+        end_counts = self.get_camera_capture_counts()
+        timing = {
+            "description": description,
+            "time": time.time() - start_time,
+            "n_frames": int(round(
+                (self.current_scene_time - start_scene_time) / self.frame_duration
+            )),
+        }
+        if start_counts is not None:
+            timing["n_mobjects"] = end_counts[1] - start_counts[1]
+            timing["n_points"] = end_counts[2] - start_counts[2]
+        self.animation_timings.append(timing)
+
+    def get_camera_capture_counts(self):
+        if isinstance(self.camera, NullCamera):
+            return self.camera.get_capture_counts()
+        return None
+
+    def get_animation_timings(self):
+        """
+        One dict per play or wait call, holding its "description", the
+        wall clock "time" it took, its number of frames, and, when
+        using a NullCamera, the number of mobjects and points which
+        would have been drawn for it.
+        """
+        return self.animation_timings
+
+    def print_animation_timings(self):
+        total_time = 0
+        for timing in self.animation_timings:
+            total_time += timing["time"]
+            line = "%8.3fs %6d frames %8.2fms/frame  %s" % (
+                timing["time"],
+                timing["n_frames"],
+                1000 * timing["time"] / max(timing["n_frames"], 1),
+                timing["description"],
+            )
+            if "n_mobjects" in timing:
+                line += " (%d mobjects, %d points)" % (
+                    timing["n_mobjects"], timing["n_points"]
+                )
+            print(line)
+        print("%8.3fs total" % total_time)
+
     def clean_up_animations(self, *animations):
         for animation in animations:
             animation.clean_up(self)
@@ -521,20 +798,30 @@ class Scene(Container):
         return []
 
     def wait(self, duration=DEFAULT_WAIT_TIME):
+        self.start_animation_timing()
+        self.perform_wait(duration)
+        self.end_animation_timing("Wait %s" % str(duration))
+        return self
+
+    def perform_wait(self, duration):
+        self.update_preview_resolution()
         if self.should_continually_update():
             total_time = 0
-            for t in self.get_time_progression(duration):
-                self.continual_update(self.frame_duration)
-                self.update_frame()
-                self.add_frames(self.get_frame())
+            time_progression = self.get_time_progression(duration)
+            for t, n_frames in self.get_frame_groups(time_progression):
+                frame_start_time = time.time()
+                self.continual_update(n_frames * self.frame_duration)
+                self.render_frame(n_frames=n_frames)
+                self.update_preview_frame_skip(time.time() - frame_start_time)
                 total_time = t
+            self.flush_rendering_pool()
         elif self.skip_animations:
             # Do nothing
             return self
         else:
             self.update_frame()
             n_frames = int(duration / self.frame_duration)
-            frame = self.get_frame()
+            frame = self.get_output_frame()
             self.add_frames(*[frame] * n_frames)
         return self
 
@@ -569,13 +856,54 @@ class Scene(Container):
                     self.save_image(
                         "frame" + str(self.frame_num), self.pngs_mode, True)
                     self.frame_num = self.frame_num + 1
-                    self.writing_process.stdin.write(frame.tostring())
+                    self.write_frame_to_movie(frame)
             else:
                 for frame in frames:
-                    self.writing_process.stdin.write(frame.tostring())
+                    self.write_frame_to_movie(frame)
         if self.save_frames:
             self.saved_frames += list(frames)
 
+    def write_frame_to_movie(self, frame):
+        if self.min_still_movie_duration is None:
+            self.write_frame_to_movie_pipe(frame)
+            return
+        # Held back until it's known how often the frame repeats
+        run = self.repeated_frame_run
+        if run is not None and self.is_repeated_frame(run[0], frame):
+            run[1] += 1
+            return
+        self.end_repeated_frame_run()
+        if self.frame_buffer_pool is not None:
+            self.frame_buffer_pool.add_use(frame)
+        self.repeated_frame_run = [frame, 1]
+
+    def is_repeated_frame(self, last_frame, frame):
+        if frame is last_frame:
+            return True
+        if not self.compare_movie_frame_contents:
+            return False
+        return frame.shape == last_frame.shape and np.array_equal(frame, last_frame)
+
+    def end_repeated_frame_run(self):
+        if self.repeated_frame_run is None:
+            return
+        frame, n_frames = self.repeated_frame_run
+        self.repeated_frame_run = None
+        if n_frames * self.frame_duration >= self.min_still_movie_duration:
+            self.write_still_movie_segment(frame, n_frames)
+        else:
+            for x in range(n_frames):
+                self.write_frame_to_movie_pipe(frame)
+        if self.frame_buffer_pool is not None:
+            self.frame_buffer_pool.release(frame)
+
+    def write_frame_to_movie_pipe(self, frame):
+        if self.frame_writer is None:
+            self.open_movie_segment_pipe()
+        if self.frame_buffer_pool is not None:
+            self.frame_buffer_pool.add_use(frame)
+        self.frame_writer.write_frame(frame)
+
     # Display methods
 
     def show_frame(self):
@@ -618,39 +946,189 @@ class Scene(Container):
         print("Writing to %s" % temp_file_path)
         self.args_to_rename_file = (temp_file_path, file_path)
 
-        fps = int(1 / self.frame_duration)
-        height = self.camera.get_pixel_height()
-        width = self.camera.get_pixel_width()
+        height, width = self.get_movie_pixel_shape()
+        self.movie_pipe_pixel_format = self.get_movie_pipe_pixel_format(
+            height, width
+        )
+        # The pipe itself is opened with the first frame piped to it,
+        # and reopened, as a new segment, after each still segment
+        self.writing_process = None
+        self.frame_writer = None
+        self.movie_segment_paths = []
+        self.still_segment_processes = []
+        self.repeated_frame_run = None
+        # Saved frames must outlive their buffers, and preview
+        # frames change shape, so neither is drawn into the pool
+        if not (self.save_frames or self.adaptive_preview):
+            self.frame_buffer_pool = FrameBufferPool(
+                self.camera.get_pixel_array().shape,
+                self.camera.pixel_array_dtype,
+                # One being drawn, one held back as a possible still,
+                # one being written, and the rest queued
+                self.max_queued_movie_frames + 3,
+            )
 
-        command = [
-            FFMPEG_BIN,
-            '-y',  # overwrite output file if it exists
+    def get_movie_pixel_shape(self):
+        if self.adaptive_preview:
+            return self.preview_pixel_shape
+        return (self.camera.get_pixel_height(), self.camera.get_pixel_width())
+
+    def get_movie_pipe_pixel_format(self, height, width):
+        transparent = self.movie_file_extension == ".mov"
+        # Chroma is sampled over 2x2 blocks of pixels
+        even_shape = height % 2 == 0 and width % 2 == 0
+        if self.pipe_yuv_to_movie and not transparent and even_shape:
+            return "yuv420p"
+        return "rgba"
+
+    def get_raw_movie_input_args(self):
+        height, width = self.get_movie_pixel_shape()
+        fps = int(1 / self.frame_duration)
+        return [
             '-f', 'rawvideo',
             '-s', '%dx%d' % (width, height),  # size of one frame
-            '-pix_fmt', 'rgba',
+            '-pix_fmt', self.movie_pipe_pixel_format,
             '-r', str(fps),  # frames per second
-            '-i', '-',  # The imput comes from a pipe
+        ]
+
+    def get_movie_output_args(self):
+        args = [
             '-an',  # Tells FFMPEG not to expect any audio
             '-loglevel', 'error',
         ]
         if self.movie_file_extension == ".mov":
             # This is if the background of the exported video
             # should be transparent.
-            command += [
+            args += [
                 '-vcodec', 'qtrle',
             ]
         else:
-            command += [
+            args += [
                 '-vcodec', 'libx264',
                 '-pix_fmt', 'yuv420p',
             ]
-        command += [temp_file_path]
+        return args
+
+    def get_next_movie_segment_path(self):
+        temp_file_path = self.args_to_rename_file[0]
+        if self.min_still_movie_duration is None:
+            # Always just the one segment
+            path = temp_file_path
+        else:
+            root, extension = os.path.splitext(temp_file_path)
+            path = "%sSegment%d%s" % (
+                root, len(self.movie_segment_paths), extension
+            )
+        self.movie_segment_paths.append(path)
+        return path
+
+    def open_movie_segment_pipe(self):
+        command = [
+            FFMPEG_BIN,
+            '-y',  # overwrite output file if it exists
+        ]
+        command += self.get_raw_movie_input_args()
+        command += [
+            '-i', '-',  # The imput comes from a pipe
+        ]
+        command += self.get_movie_output_args()
+        command += [self.get_next_movie_segment_path()]
         # self.writing_process = sp.Popen(command, stdin=sp.PIPE, shell=True)
         self.writing_process = sp.Popen(command, stdin=sp.PIPE)
+        release_frame = None
+        if self.frame_buffer_pool is not None:
+            release_frame = self.frame_buffer_pool.release
+        self.frame_writer = FrameWriter(
+            self.writing_process.stdin,
+            self.max_queued_movie_frames,
+            release_frame,
+            self.movie_pipe_pixel_format,
+            self.n_yuv_conversion_threads,
+        )
 
-    def close_movie_pipe(self):
+    def close_movie_segment_pipe(self):
+        if self.frame_writer is None:
+            return
+        self.frame_writer.close()
         self.writing_process.stdin.close()
         self.writing_process.wait()
+        self.frame_writer = None
+        self.writing_process = None
+
+    def write_still_movie_segment(self, frame, n_frames):
+        """
+        ffmpeg loops over one raw frame, so the frame is
+        converted and piped just once
+        """
+        self.close_movie_segment_pipe()
+        path = self.get_next_movie_segment_path()
+        still_path = os.path.splitext(path)[0] + ".raw"
+        if self.movie_pipe_pixel_format == "yuv420p":
+            rgba_to_yuv420p(frame).tofile(still_path)
+        else:
+            np.ascontiguousarray(frame).tofile(still_path)
+        command = [
+            FFMPEG_BIN,
+            '-y',
+        ]
+        command += self.get_raw_movie_input_args()
+        command += [
+            '-stream_loop', '-1',
+            '-i', still_path,
+            '-frames:v', str(n_frames),
+        ]
+        command += self.get_movie_output_args()
+        command += [path]
+        while len(self.still_segment_processes) >= self.max_still_segment_processes:
+            self.wait_for_still_segment_process()
+        # Left to finish alongside everything else
+        self.still_segment_processes.append(
+            (sp.Popen(command), still_path)
+        )
+
+    def wait_for_still_segment_process(self):
+        """
+        Waits for the oldest of those still running
+        """
+        process, still_path = self.still_segment_processes.pop(0)
+        if process.wait() != 0:
+            raise Exception("Failed to write still segment from %s" % still_path)
+        os.remove(still_path)
+
+    def concatenate_movie_segments(self, file_path):
+        list_path = os.path.splitext(file_path)[0] + "Segments.txt"
+        with open(list_path, "w") as outfile:
+            for path in self.movie_segment_paths:
+                path = os.path.abspath(path).replace("'", "'\\''")
+                outfile.write("file '%s'\n" % path)
+        command = [
+            FFMPEG_BIN,
+            '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', list_path,
+            '-c', 'copy',  # Joined as they are, with no reencoding
+            '-loglevel', 'error',
+            file_path,
+        ]
+        return_code = sp.call(command)
+        if return_code != 0:
+            raise Exception(
+                "Failed to join movie segments listed in %s" % list_path
+            )
+        for path in self.movie_segment_paths + [list_path]:
+            os.remove(path)
+
+    def close_movie_pipe(self):
+        self.end_repeated_frame_run()
+        self.close_movie_segment_pipe()
+        while self.still_segment_processes:
+            self.wait_for_still_segment_process()
+        temp_file_path = self.args_to_rename_file[0]
+        if len(self.movie_segment_paths) > 1:
+            self.concatenate_movie_segments(temp_file_path)
+        elif self.movie_segment_paths != [temp_file_path]:
+            shutil.move(self.movie_segment_paths[0], temp_file_path)
         if os.name == 'nt':
             shutil.move(*self.args_to_rename_file)
         else:
@@ -3,6 +3,7 @@ import os
 
 from PIL import Image
 from constants import RASTER_IMAGE_DIR
+from utils.bezier import interpolate
 
 
 def get_full_raster_image_path(image_file_name):
@@ -19,6 +20,154 @@ def get_full_raster_image_path(image_file_name):
     raise IOError("File %s not Found" % image_file_name)
 
 
+def get_nonzero_alpha_bounding_box(rgba_array):
+    """
+    Returns (x_min, y_min, x_max, y_max), inclusive, of the pixels
+    of rgba_array which aren't fully transparent, or None if there
+    are no such pixels.
+    """
+    has_alpha = rgba_array[:, :, 3] != 0
+    rows = np.flatnonzero(has_alpha.any(1))
+    if len(rows) == 0:
+        return None
+    cols = np.flatnonzero(has_alpha[rows[0]:rows[-1] + 1].any(0))
+    return (cols[0], rows[0], cols[-1], rows[-1])
+
+
+def alpha_composite_in_place(dst, src):
+    """
+    Composites the uint8 rgba array src on top of dst, writing the
+    result into dst.  This follows the same integer arithmetic as
+    PIL's Image.alpha_composite, so results match it exactly, but
+    no intermediate images are allocated beyond the size of src.
+    """
+    precision_bits = 7
+    src_alpha = src[:, :, 3].astype('uint32')
+    visible = src_alpha != 0
+    if not np.any(visible):
+        return dst
+    src = src.astype('uint32')
+    dst_ints = dst.astype('uint32')
+    blend = dst_ints[:, :, 3] * (255 - src_alpha)
+    out_alpha_255 = src_alpha * 255 + blend
+    # Where src is fully transparent out_alpha_255 might be 0,
+    # but those pixels are left untouched anyway
+    coef1 = (src_alpha * 255 * 255 << precision_bits) // np.maximum(out_alpha_255, 1)
+    coef2 = (255 << precision_bits) - coef1
+
+    def shift_for_div_255(a):
+        return ((a >> 8) + a) >> 8
+
+    rgb = src[:, :, :3] * coef1[:, :, np.newaxis]
+    rgb += dst_ints[:, :, :3] * coef2[:, :, np.newaxis]
+    rgb = shift_for_div_255(rgb + (0x80 << precision_bits)) >> precision_bits
+    alpha = shift_for_div_255(out_alpha_255 + 0x80)
+    dst[:, :, :3][visible] = rgb[visible]
+    dst[:, :, 3][visible] = alpha[visible]
+    return dst
+
+
+def get_bilinear_samples(array, xs, ys):
+    """
+    Samples the (height, width, n_channels) array at the (possibly
+    fractional) coordinates xs and ys, with pixel centers at integers,
+    interpolating linearly between neighboring pixels.  Coordinates
+    outside the array are clamped to its edge.
+    """
+    height, width = array.shape[:2]
+    xs = np.clip(xs, 0, width - 1)
+    ys = np.clip(ys, 0, height - 1)
+    x_floors = np.minimum(xs.astype(int), width - 2)
+    y_floors = np.minimum(ys.astype(int), height - 2)
+    x_fracs = (xs - x_floors)[..., np.newaxis]
+    y_fracs = (ys - y_floors)[..., np.newaxis]
+    top = interpolate(
+        array[y_floors, x_floors],
+        array[y_floors, x_floors + 1],
+        x_fracs
+    )
+    bottom = interpolate(
+        array[y_floors + 1, x_floors],
+        array[y_floors + 1, x_floors + 1],
+        x_fracs
+    )
+    return interpolate(top, bottom, y_fracs)
+
+
+# BT.601, limited range.  Rows give Y, Cb and Cr as
+# weighted sums of R, G and B, all on a scale of 0 to 255
+RGB_TO_YCBCR_MATRIX = np.array([
+    [65.481, 128.553, 24.966],
+    [-37.797, -74.203, 112.0],
+    [112.0, -93.786, -18.214],
+]) / 255.0
+
+
+def rgba_to_yuv420p(rgba, out=None, thread_pool=None, n_bands=1):
+    """
+    Converts a uint8 (height, width, 4) rgba array, with even height
+    and width, to the flat yuv420p layout ffmpeg reads: a full size Y
+    plane, then U and V planes at half the height and width, each
+    from the average of a 2x2 block.  Alpha is ignored.  Written into
+    out, if it's a uint8 array of the right size.
+
+    Given a thread_pool, like a concurrent.futures.ThreadPoolExecutor,
+    the rows are split into n_bands bands converted at once on its
+    threads, as numpy releases the GIL while doing the arithmetic.
+    """
+    height, width = rgba.shape[:2]
+    n_pixels = height * width
+    if out is None or out.size != n_pixels * 3 // 2:
+        out = np.empty(n_pixels * 3 // 2, dtype='uint8')
+    n_bands = min(n_bands, height // 2)
+    if thread_pool is None or n_bands <= 1:
+        rgba_rows_to_yuv420p(rgba, out, 0, height)
+        return out
+    # Bands start on even rows, so no 2x2 block is split
+    edges = 2 * np.linspace(0, height // 2, n_bands + 1).astype(int)
+    futures = [
+        thread_pool.submit(rgba_rows_to_yuv420p, rgba, out, y0, y1)
+        for y0, y1 in zip(edges[:-1], edges[1:])
+    ]
+    for future in futures:
+        future.result()
+    return out
+
+
+def rgba_rows_to_yuv420p(rgba, out, y0, y1):
+    """
+    Writes the part of out, as given by rgba_to_yuv420p, coming
+    from rows y0 through y1 of rgba, where y0 and y1 are even
+    """
+    height, width = rgba.shape[:2]
+    n_pixels = height * width
+    rgba = rgba[y0:y1]
+    weights = RGB_TO_YCBCR_MATRIX.astype('float32')
+    # Weighting one channel at a time, straight from the uint8 array,
+    # is much quicker than taking a dot product over the last axis.
+    # The extra 0.5 rounds, rather than truncates, when cast to uint8,
+    # and no clipping is needed, as the weights keep values in range.
+    luma = rgba[:, :, 0] * weights[0, 0]
+    luma += rgba[:, :, 1] * weights[0, 1]
+    luma += rgba[:, :, 2] * weights[0, 2]
+    luma += 16.5
+    out[y0 * width:y1 * width] = luma.ravel()
+    block_sums = rgba[0::2, 0::2, :3].astype('uint16')
+    block_sums += rgba[0::2, 1::2, :3]
+    block_sums += rgba[1::2, 0::2, :3]
+    block_sums += rgba[1::2, 1::2, :3]
+    n_chroma = n_pixels // 4
+    chroma_start = (y0 // 2) * (width // 2)
+    chroma_end = (y1 // 2) * (width // 2)
+    for index, plane_start in [(1, n_pixels), (2, n_pixels + n_chroma)]:
+        chroma = block_sums[:, :, 0] * (weights[index, 0] / 4)
+        chroma += block_sums[:, :, 1] * (weights[index, 1] / 4)
+        chroma += block_sums[:, :, 2] * (weights[index, 2] / 4)
+        chroma += 128.5
+        out[plane_start + chroma_start:plane_start + chroma_end] = chroma.ravel()
+    return out
+
+
 def drag_pixels(frames):
     curr = frames[0]
     new_frames = []
@@ -0,0 +1,126 @@
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from utils.images import alpha_composite_in_place
+from utils.images import rgba_to_yuv420p
+
+import numpy as np
+
+
+SEED = 386735
+np.random.seed(SEED)
+
+
+def get_random_rgba_array(height, width):
+    array = np.random.randint(0, 256, (height, width, 4)).astype('uint8')
+    # Make sure the extremes of alpha, where PIL takes
+    # shortcuts, come up often
+    alphas = array[:, :, 3]
+    alphas[::5] = 0
+    alphas[1::5] = 255
+    return array
+
+
+def test_alpha_composite_in_place_matches_PIL():
+    dst = get_random_rgba_array(40, 30)
+    src = get_random_rgba_array(40, 30)
+    expected = np.array(Image.alpha_composite(
+        Image.fromarray(dst), Image.fromarray(src)
+    ))
+    result = alpha_composite_in_place(dst, src)
+    assert result is dst
+    assert np.array_equal(dst, expected)
+
+
+def test_alpha_composite_in_place_all_alpha_pairs():
+    # Every combination of source and destination alpha,
+    # with a few different colors for each
+    src_alphas, dst_alphas = np.meshgrid(np.arange(256), np.arange(256))
+    dst = get_random_rgba_array(256, 256)
+    src = get_random_rgba_array(256, 256)
+    dst[:, :, 3] = dst_alphas
+    src[:, :, 3] = src_alphas
+    expected = np.array(Image.alpha_composite(
+        Image.fromarray(dst), Image.fromarray(src)
+    ))
+    alpha_composite_in_place(dst, src)
+    assert np.array_equal(dst, expected)
+
+
+def test_alpha_composite_in_place_on_view():
+    dst = get_random_rgba_array(50, 60)
+    src = get_random_rgba_array(20, 10)
+    original = dst.copy()
+    expected = np.array(Image.alpha_composite(
+        Image.fromarray(dst[5:25, 7:17].copy()), Image.fromarray(src)
+    ))
+    alpha_composite_in_place(dst[5:25, 7:17], src)
+    assert np.array_equal(dst[5:25, 7:17], expected)
+    # Nothing outside the view is touched
+    dst[5:25, 7:17] = original[5:25, 7:17]
+    assert np.array_equal(dst, original)
+
+
+def test_alpha_composite_in_place_transparent_source():
+    dst = get_random_rgba_array(10, 10)
+    original = dst.copy()
+    alpha_composite_in_place(dst, np.zeros((10, 10, 4), dtype='uint8'))
+    assert np.array_equal(dst, original)
+
+
+def get_reference_yuv420p(rgba):
+    # BT.601, limited range, computed plainly in float64
+    matrix = np.array([
+        [65.481, 128.553, 24.966],
+        [-37.797, -74.203, 112.0],
+        [112.0, -93.786, -18.214],
+    ]) / 255.0
+    rgb = rgba[:, :, :3].astype('float64')
+    luma = np.dot(rgb, matrix[0]) + 16
+    height, width = rgba.shape[:2]
+    block_means = rgb.reshape((height // 2, 2, width // 2, 2, 3)).mean((1, 3))
+    cb = np.dot(block_means, matrix[1]) + 128
+    cr = np.dot(block_means, matrix[2]) + 128
+    return np.round(np.concatenate([
+        luma.ravel(), cb.ravel(), cr.ravel()
+    ])).astype('uint8')
+
+
+def test_rgba_to_yuv420p():
+    rgba = get_random_rgba_array(24, 38)
+    result = rgba_to_yuv420p(rgba)
+    assert result.dtype == np.uint8
+    assert result.shape == (24 * 38 * 3 // 2,)
+    expected = get_reference_yuv420p(rgba)
+    # Computed in float32, so it can round the other way at halves
+    assert np.abs(result.astype(int) - expected).max() <= 1
+
+
+def test_rgba_to_yuv420p_extremes():
+    rgba = np.zeros((2, 4, 4), dtype='uint8')
+    rgba[:, 2:, :3] = 255
+    result = rgba_to_yuv420p(rgba)
+    assert list(result[:8]) == [16, 16, 235, 235] * 2
+    assert list(result[8:]) == [128, 128, 128, 128]
+    # Pure red
+    rgba = np.zeros((2, 2, 4), dtype='uint8')
+    rgba[:, :, 0] = 255
+    assert list(rgba_to_yuv420p(rgba)) == [81, 81, 81, 81, 90, 240]
+
+
+def test_rgba_to_yuv420p_reuses_out():
+    rgba = get_random_rgba_array(10, 20)
+    out = np.zeros(10 * 20 * 3 // 2, dtype='uint8')
+    assert rgba_to_yuv420p(rgba, out) is out
+    assert np.array_equal(out, rgba_to_yuv420p(rgba))
+    # The wrong size is replaced
+    out = np.zeros(7, dtype='uint8')
+    assert rgba_to_yuv420p(rgba, out) is not out
+
+
+def test_rgba_to_yuv420p_in_bands():
+    rgba = get_random_rgba_array(46, 30)
+    expected = rgba_to_yuv420p(rgba)
+    with ThreadPoolExecutor(max_workers=3) as thread_pool:
+        for n_bands in [1, 2, 3, 5, 23, 100]:
+            result = rgba_to_yuv420p(rgba, None, thread_pool, n_bands)
+            assert np.array_equal(result, expected)